@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+"""histogram.py
+================
+Fixed-bucket age histogram used by the streaming collectors.
+
+Values are folded into a handful of counters as they arrive, so memory stays
+constant no matter how many nodes are streamed.  Items that were *counted* but
+never *seen* (e.g. the middle of a paginated listing) can be spread over the
+age band they are known to fall into with ``with_pending``.
+
+* ``AgeHistogram().add(age_days)``
+* ``AgeHistogram.summary() -> {"avg", "oldest", "30d", "90d", "365d", ...}``
+"""
+
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# Bucket lower edges in days; the last bucket is open-ended.  30/90/365 must
+# stay edges so the threshold counters in ``summary`` are exact.
+DEFAULT_EDGES: tuple[int, ...] = (0, 7, 30, 90, 180, 365, 730, 1095, 1825)
+
+
+class AgeHistogram:
+    """Streaming histogram of ages (days) with interpolated quantiles."""
+
+    __slots__ = ("edges", "counts", "n", "total_age", "oldest")
+
+    def __init__(self, edges: Sequence[float] = DEFAULT_EDGES):
+        self.edges: tuple[float, ...] = tuple(edges)
+        self.counts: List[float] = [0.0] * len(self.edges)
+        self.n = 0.0
+        self.total_age = 0.0
+        self.oldest: Optional[float] = None
+
+    # ───────────────────────── ingestion ──────────────────────────
+    def bucket(self, age: float) -> int:
+        return max(0, bisect_right(self.edges, age) - 1)
+
+    def add(self, age: float) -> None:
+        self.counts[self.bucket(age)] += 1
+        self.n += 1
+        self.total_age += age
+        if self.oldest is None or age > self.oldest:
+            self.oldest = age
+
+    def add_many(self, ages: Iterable[float]) -> None:
+        for age in ages:
+            self.add(age)
+
+    def with_pending(self, count: float, lo: float,
+                     hi: float) -> "AgeHistogram":
+        """Return a copy with *count* unseen items spread uniformly over
+        ``[lo, hi]`` days."""
+        out = AgeHistogram(self.edges)
+        out.counts = list(self.counts)
+        out.n, out.total_age, out.oldest = self.n, self.total_age, self.oldest
+        if count <= 0:
+            return out
+        lo, hi = min(lo, hi), max(lo, hi)
+        out.n += count
+        out.total_age += count * (lo + hi) / 2
+        first, last = out.bucket(lo), out.bucket(hi)
+        if first == last or hi == lo:
+            out.counts[first] += count
+            return out
+        width = hi - lo
+        for i in range(first, last + 1):
+            b_lo = max(lo, self.edges[i])
+            b_hi = hi if i + 1 >= len(self.edges) else min(hi,
+                                                           self.edges[i + 1])
+            out.counts[i] += count * max(0.0, b_hi - b_lo) / width
+        return out
+
+    # ───────────────────────── queries ────────────────────────────
+    def count_at_least(self, age: float) -> float:
+        """Items with age >= *age*; exact when *age* is a bucket edge."""
+        i = self.bucket(age)
+        return sum(self.counts[i:])
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.n <= 0:
+            return None
+        target = q * self.n
+        running = 0.0
+        for i, c in enumerate(self.counts):
+            if c and running + c >= target:
+                lo = self.edges[i]
+                if i + 1 < len(self.edges):
+                    hi = self.edges[i + 1]
+                else:
+                    hi = max(lo, self.oldest or lo)
+                if self.oldest is not None:
+                    hi = min(hi, max(lo, self.oldest))
+                return lo + (hi - lo) * (target - running) / c
+            running += c
+        return self.oldest
+
+    def summary(self) -> Dict[str, Any]:
+        if self.n <= 0:
+            return {"avg": None, "oldest": None, "30d": 0, "90d": 0,
+                    "365d": 0}
+        return {
+            "avg": self.total_age / self.n,
+            "oldest": self.oldest,
+            "30d": round(self.count_at_least(30)),
+            "90d": round(self.count_at_least(90)),
+            "365d": round(self.count_at_least(365)),
+            "p50": _round(self.quantile(0.5)),
+            "p90": _round(self.quantile(0.9)),
+            "histogram": {
+                "edges": list(self.edges),
+                "counts": [round(c, 1) for c in self.counts],
+            },
+        }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
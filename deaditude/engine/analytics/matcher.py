@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+"""matcher.py
+==============
+Aho-Corasick multi-pattern matcher for tech names in titles.
+
+All aliases of all techs are compiled into one automaton, so a title is
+scanned once – O(len(title) + matches) – no matter how many techs are in the
+registry.  Matching is case-insensitive and only accepts whole-word hits
+(``go`` does not match ``good``; ``node.js`` and ``c#`` still work).
+
+* ``TermMatcher({"vue": ["vue", "vue.js"], ...}).find(title) -> {"vue"}``
+* ``tech_aliases(tech) -> {"vue.js", "vuejs", ...}`` for a registry tech
+
+Only the display name (plus its usual spellings) and the registry's curated
+``aliases`` are matched – never the id, which is often an everyday word
+(``october``, ``spring``, ``phoenix``, ``nest``).
+"""
+
+import re
+from collections import deque
+from typing import Any, Dict, Iterable, List, Mapping, Set, Tuple, Union
+
+
+def _is_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+_JS_SUFFIX = re.compile(r"[. ]?js$")
+_PUNCT = re.compile(r"[^\w\s]+")
+
+
+def _name_variants(name: str) -> Set[str]:
+    """Lower-cased *name* and the spellings titles use for it: any
+    ``js`` suffix as ``.js`` / ``js`` / `` js`` (``express js`` ->
+    ``express.js``), and multi-word names without punctuation
+    (``joomla! cms`` -> ``joomla cms``).  The bare stem of a ``.js`` name
+    is not added – ``express`` or ``next`` alone are ordinary words."""
+    name = " ".join(name.lower().split())
+    variants = {name}
+    stem = _JS_SUFFIX.sub("", name)
+    if stem and stem != name:
+        variants.update(f"{stem}{sep}js" for sep in (".", "", " "))
+    plain = " ".join(_PUNCT.sub(" ", name).split())
+    if len(plain.split()) > 1:
+        variants.add(plain)
+    return variants
+
+
+def tech_aliases(tech: Union[str, Mapping[str, Any]]) -> Set[str]:
+    """Name variants and curated ``aliases`` of a registry tech (or just the
+    name variants when *tech* is a string)."""
+    if isinstance(tech, str):
+        return _name_variants(tech)
+    aliases = _name_variants(tech["name"])
+    aliases.update(a.strip().lower() for a in tech.get("aliases") or [])
+    return aliases
+
+
+class TermMatcher:
+    """Maps every key to its aliases and reports the keys found in a text."""
+
+    def __init__(self, terms: Mapping[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]
+        for key, aliases in terms.items():
+            for alias in aliases:
+                alias = alias.strip().lower()
+                if alias:
+                    self._insert(alias, key)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    # ───────────────────────── construction ───────────────────────
+    def _insert(self, alias: str, key: str) -> None:
+        node = 0
+        for ch in alias:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(alias), key))
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    # ───────────────────────── matching ───────────────────────────
+    def find(self, text: str) -> Set[str]:
+        """Keys with at least one whole-word alias occurrence in *text*."""
+        text = text.lower()
+        found: Set[str] = set()
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, key in self._out[node]:
+                if key in found:
+                    continue
+                start, end = i - length + 1, i + 1
+                if (start == 0 or not _is_word(text[start - 1])) and (
+                    end == len(text) or not _is_word(text[end])
+                ):
+                    found.add(key)
+        return found
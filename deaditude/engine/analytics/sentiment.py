@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+"""sentiment.py
+================
+Batched, cached polarity scoring for short texts (post titles).
+
+* One backend per process, picked with ``SENTIMENT_BACKEND`` and loaded on
+  first use: ``lexicon`` scores a whole list in one NumPy pass over the VADER
+  lexicon; ``textblob`` (``PatternAnalyzer``) and ``vader`` run the full
+  per-text analyzers.
+* Polarities are cached by a hash of ``backend + text`` in a bounded LRU that
+  is persisted under ``CACHE_DIR`` by ``save_cache`` – once per run, from the
+  CLI or at exit – so titles seen on earlier runs are never re-scored.
+
+* ``score_texts(texts) -> [polarity, ...]`` (each in ``[-1, 1]``)
+* ``save_cache()``
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from packages.cache.store import CACHE_DIR
+
+BACKEND = os.getenv("SENTIMENT_BACKEND", "lexicon").lower()
+CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "50000"))
+BATCH_SIZE = 256
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Backends – each returns a callable scoring a list of texts in one pass
+# ---------------------------------------------------------------------------
+def _textblob_backend() -> Callable[[Sequence[str]], List[float]]:
+    from textblob.en.sentiments import PatternAnalyzer
+
+    analyzer = PatternAnalyzer()  # lexicon parsed once, no TextBlob objects
+
+    def score(texts: Sequence[str]) -> List[float]:
+        return [analyzer.analyze(t).polarity for t in texts]
+
+    return score
+
+
+def _vader_analyzer():
+    import nltk
+    from nltk.sentiment import SentimentIntensityAnalyzer
+
+    try:
+        nltk.data.find("sentiment/vader_lexicon.zip")
+    except LookupError:
+        nltk.download("vader_lexicon", quiet=True)
+    return SentimentIntensityAnalyzer()
+
+
+def _vader_backend() -> Callable[[Sequence[str]], List[float]]:
+    analyzer = _vader_analyzer()
+
+    def score(texts: Sequence[str]) -> List[float]:
+        return [analyzer.polarity_scores(t)["compound"] for t in texts]
+
+    return score
+
+
+_WORD = re.compile(r"[a-z][a-z']*")
+_NEGATIONS = frozenset((
+    "not", "no", "never", "none", "nobody", "nothing", "neither", "nor",
+    "nowhere", "without", "cannot", "aint", "dont", "doesnt", "didnt",
+    "isnt", "wasnt", "arent", "werent", "cant", "couldnt", "wont",
+    "wouldnt", "shouldnt",
+))
+_NEGATION_SPAN = 3  # words after a negation that are flipped, as in VADER
+_NEGATION_SCALAR = -0.74
+_NORM_ALPHA = 15.0  # VADER's compound normalisation
+
+
+def _lexicon_backend() -> Callable[[Sequence[str]], List[float]]:
+    """VADER's valences summed per text and normalised like its compound
+    score, with negation flipping the next words; the boosters, caps and
+    "but" rules of the full analyzer are left out so that, after one
+    tokenising pass, the whole list is scored with array operations."""
+    lexicon = _vader_analyzer().lexicon
+
+    def score(texts: Sequence[str]) -> List[float]:
+        words = [_WORD.findall(t.lower()) for t in texts]
+        flat = [w for ws in words for w in ws]
+        owner = np.repeat(np.arange(len(texts)),
+                          [len(ws) for ws in words])
+        valence = np.fromiter((lexicon.get(w, 0.0) for w in flat),
+                              dtype=float, count=len(flat))
+        negation = np.fromiter(
+            (w in _NEGATIONS or w.endswith("n't") for w in flat),
+            dtype=bool, count=len(flat),
+        )
+        flipped = np.zeros(len(flat), dtype=bool)
+        for k in range(1, _NEGATION_SPAN + 1):
+            flipped[k:] |= negation[:-k] & (owner[k:] == owner[:-k])
+        valence[flipped] *= _NEGATION_SCALAR
+        sums = np.bincount(owner, weights=valence, minlength=len(texts))
+        return (sums / np.sqrt(sums * sums + _NORM_ALPHA)).tolist()
+
+    return score
+
+
+_BACKENDS: Dict[str, Callable[[], Callable[[Sequence[str]], List[float]]]] = {
+    "lexicon": _lexicon_backend,
+    "textblob": _textblob_backend,
+    "vader": _vader_backend,
+}
+
+_scorer: Optional[Callable[[Sequence[str]], List[float]]] = None
+_lock = threading.Lock()
+
+
+def _get_scorer() -> Callable[[Sequence[str]], List[float]]:
+    global _scorer
+    if _scorer is None:
+        if BACKEND not in _BACKENDS:
+            raise ValueError(f"Unknown SENTIMENT_BACKEND '{BACKEND}'")
+        _scorer = _BACKENDS[BACKEND]()
+        logger.debug("Sentiment backend '%s' loaded", BACKEND)
+    return _scorer
+
+
+# ---------------------------------------------------------------------------
+# Persistent LRU
+# ---------------------------------------------------------------------------
+class _PolarityLRU:
+    def __init__(self, path: str, capacity: int):
+        self.path = path
+        self.capacity = capacity
+        self._data: Optional[OrderedDict[str, float]] = None
+        self._dirty = False
+
+    def _load(self) -> OrderedDict[str, float]:
+        if self._data is None:
+            self._data = OrderedDict()
+            try:
+                with open(self.path, "r", encoding="utf-8") as fh:
+                    self._data.update(json.load(fh))  # stored oldest → newest
+            except FileNotFoundError:
+                pass
+            except Exception as exc:
+                logger.warning("Discarding unreadable sentiment cache: %s",
+                               exc)
+        return self._data
+
+    def get(self, key: str) -> Optional[float]:
+        data = self._load()
+        if key in data:
+            data.move_to_end(key)
+            return data[key]
+        return None
+
+    def put(self, key: str, value: float) -> None:
+        data = self._load()
+        data[key] = value
+        data.move_to_end(key)
+        self._dirty = True
+        while len(data) > self.capacity:
+            data.popitem(last=False)
+
+    def save(self) -> None:
+        if self._data is None or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(self._data, fh, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+_cache = _PolarityLRU(os.path.join(CACHE_DIR, f"sentiment_{BACKEND}.json"),
+                      CACHE_SIZE)
+
+
+def _key(text: str) -> str:
+    return hashlib.sha1(f"{BACKEND}\0{text}".encode("utf-8")).hexdigest()[:20]
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+def score_texts(texts: Sequence[str]) -> List[float]:
+    """Polarity for every text, scoring only cache misses, in batches."""
+    with _lock:
+        keys = [_key(t) for t in texts]
+        out: List[Optional[float]] = [_cache.get(k) for k in keys]
+        misses = [i for i, v in enumerate(out) if v is None]
+        if misses:
+            try:
+                scorer = _get_scorer()
+                for start in range(0, len(misses), BATCH_SIZE):
+                    batch = misses[start: start + BATCH_SIZE]
+                    scores = scorer([texts[i] for i in batch])
+                    for i, pol in zip(batch, scores):
+                        out[i] = pol
+                        _cache.put(keys[i], pol)
+            except Exception as exc:
+                logger.debug("Sentiment scoring failed: %s", exc)
+        return [v if v is not None else 0.0 for v in out]
+
+
+def save_cache() -> None:
+    """Persist the polarities scored since the last save (a no-op when
+    nothing new was scored); also run at interpreter exit."""
+    with _lock:
+        try:
+            _cache.save()
+        except Exception as exc:
+            logger.warning("Cannot persist sentiment cache: %s", exc)
+
+
+atexit.register(save_cache)
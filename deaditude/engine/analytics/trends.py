@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+"""trends.py
+=============
+Vectorised period trend shared by the Reddit, Stack Overflow and YouTube
+collectors.
+
+Timestamps are split into ``periods`` equal slices between the oldest and
+the newest one with a single ``numpy.histogram`` pass (the newest item closes
+the last slice), optional per-item weights are averaged per slice, and the
+per-period counts are classified by one of the direction rules the
+collectors have always used:
+
+* ``"endpoints"`` – first vs last period (Stack Overflow)
+* ``"strict"``    – increasing / decreasing only if strictly monotonic,
+  otherwise stable (Reddit)
+* ``"shape"``     – monotonic runs are increasing / decreasing, other
+  up- or down-ward shapes are growing / declining (YouTube)
+
+* ``period_trend(timestamps, weights, periods) -> {...} | None``
+* ``series_trend(counts, periods) -> {...}`` for counts that are already
+  bucketed (e.g. one count-only API call per week)
+* ``iso_to_epoch(["2024-01-02T03:04:05Z", ...]) -> ndarray``
+"""
+
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+MIN_SPAN_SECONDS = 86_400
+
+
+def iso_to_epoch(values: Iterable[str]) -> np.ndarray:
+    """Epoch seconds for UTC ISO-8601 strings, parsed in one call."""
+    return (
+        np.array([v.rstrip("Z") for v in values], dtype="datetime64[s]")
+        .astype(np.int64)
+        .astype(float)
+    )
+
+
+def _direction(counts: np.ndarray, rule: str) -> str:
+    first, last = counts[0], counts[-1]
+    steps = np.diff(counts)
+    if rule == "strict":
+        if (steps > 0).all():
+            return "increasing"
+        if (steps < 0).all():
+            return "decreasing"
+        return "stable"
+    if rule == "shape":
+        if (steps == 0).all():
+            return "stable"
+        if first < last:
+            return "increasing" if (steps >= 0).all() else "growing"
+        return "decreasing" if (steps <= 0).all() else "declining"
+    if rule == "endpoints":
+        if first < last:
+            return "increasing"
+        if first > last:
+            return "decreasing"
+        return "stable"
+    raise ValueError(f"Unknown trend rule '{rule}'")
+
+
+def _slope(series: np.ndarray) -> float:
+    if len(series) < 2:
+        return 0.0
+    return float(np.polyfit(np.arange(len(series)), series, 1)[0])
+
+
+def _describe(counts: np.ndarray, rule: str) -> Dict[str, Any]:
+    return {
+        "direction": _direction(counts, rule),
+        "growth": float(counts[-1] / counts[0] - 1) if counts[0] else 0,
+        "slope": _slope(counts),
+        "counts": counts.tolist(),
+    }
+
+
+def series_trend(
+    counts: Sequence[float],
+    periods: Optional[int] = None,
+    rule: str = "endpoints",
+) -> Dict[str, Any]:
+    """Describe a non-empty, oldest-first series of per-window counts.
+
+    With *periods* the series is first summed into that many equal groups
+    of consecutive windows (the oldest ``len % periods`` windows are left
+    out), so e.g. 26 weekly counts can be judged like a three-period split
+    while ``slope`` keeps the per-window resolution of the full series.
+    """
+    series = np.asarray(counts, dtype=float)
+    grouped = series
+    if periods and periods < len(series):
+        usable = series[len(series) % periods:]
+        grouped = usable.reshape(periods, -1).sum(axis=1)
+    out = _describe(grouped.astype(int), rule)
+    out["slope"] = _slope(series)
+    return out
+
+
+def period_trend(
+    timestamps: Sequence[float],
+    weights: Optional[Sequence[float]] = None,
+    periods: int = 3,
+    rule: str = "endpoints",
+    min_span: float = MIN_SPAN_SECONDS,
+) -> Optional[Dict[str, Any]]:
+    """Bucket *timestamps* into *periods* slices and describe the trend.
+
+    Returns ``None`` when there is nothing to split (no items, or all of
+    them within *min_span* seconds).  Otherwise the dict holds
+
+    * ``direction`` – label from *rule*
+    * ``growth``    – last / first period count − 1 (0 if the first is 0)
+    * ``slope``     – least-squares change in count per period
+    * ``counts``    – items per period, oldest first
+    * ``weight_means`` – mean weight per period (non-finite weights are
+      ignored, empty periods are 0); only when *weights* is given
+    """
+    ts = np.asarray(timestamps, dtype=float)
+    if ts.size == 0:
+        return None
+    oldest, newest = ts.min(), ts.max()
+    if newest - oldest < min_span:
+        return None
+
+    edges = np.linspace(oldest, newest, periods + 1)
+    counts, _ = np.histogram(ts, bins=edges)
+    out = _describe(counts, rule)
+
+    if weights is not None:
+        w = np.asarray(weights, dtype=float)
+        ok = np.isfinite(w)
+        sums, _ = np.histogram(ts[ok], bins=edges, weights=w[ok])
+        n, _ = np.histogram(ts[ok], bins=edges)
+        means = np.divide(sums, n, out=np.zeros(periods), where=n > 0)
+        out["weight_means"] = means.tolist()
+    return out
@@ -52,6 +52,7 @@ from engine.collectors import (
 from engine.collectors.stackoverflow import APIBanError
 
 from engine.scoring.scoring import calculate_deaditude_score
+from engine.analytics.sentiment import save_cache as save_sentiment_cache
 
 # Database operations
 from packages.db.supabase import (
@@ -370,13 +371,10 @@ COLLECTORS: Dict[str, Any] = {
         "reddit", lambda t: reddit.collect_reddit_signals(t)
     ),
     "hn": create_throttled_collector("hn",
-                                     lambda t: hn.collect_hn_signals(
-                                         t["name"])),
+                                     lambda t: hn.collect_hn_signals(t)),
     "stackoverflow": create_throttled_collector(
         "stackoverflow",
-        lambda t: stackoverflow.collect_so_signals(
-            t["name"].replace(" ", "-").lower()
-        )
+        lambda t: stackoverflow.collect_so_signals(stackoverflow.tag_for(t))
     ),
     "youtube": create_throttled_collector(
         "youtube",
@@ -389,6 +387,26 @@ COLLECTORS: Dict[str, Any] = {
                                        lambda t: jobs.collect_jobs_signals(t)),
 }
 
+# Optional per-collector pre-pass over the whole batch, run once before the
+# per-tech loop so that shared work is not repeated for every tech.
+BATCH_PREPARERS: Dict[str, Callable[[list], None]] = {
+    "hn": hn.prepare_batch,
+    "reddit": reddit.prepare_batch,
+    "stackoverflow": stackoverflow.prepare_batch,
+    "youtube": youtube.prepare_batch,
+}
+
+
+def _prepare_batch(batch, selected):
+    for key in selected:
+        prepare = BATCH_PREPARERS.get(key)
+        if prepare is None:
+            continue
+        try:
+            prepare(batch)
+        except Exception as e:
+            logger.warning(f"Batch pre-pass for {key} failed: {e}")
+
 # ---------------------------------------------------------------------------
 #  Helper functions
 # ---------------------------------------------------------------------------
@@ -451,10 +469,15 @@ def _get_due_batch(all_techs):
 
 
 def _max_batch():
-    """Calculate maximum batch size based on API limits."""
+    """Calculate maximum batch size based on API limits.
+
+    The GitHub hourly limit applies per token, so it scales with the number
+    of credentials in the GitHub pool.
+    """
+    github_tokens = max(1, len(github.TOKENS))
     return min(
         GOOGLE_CSE_DAILY_LIMIT // GOOGLE_COST_PER_TECH,
-        GITHUB_API_HOURLY_LIMIT // GITHUB_COST_PER_TECH,
+        GITHUB_API_HOURLY_LIMIT * github_tokens // GITHUB_COST_PER_TECH,
     )
 
 
@@ -547,7 +570,8 @@ def run_batch(techTest=None, analyzers=None):
     )
     print(
         f"🔒 Quotas – Google CSE {GOOGLE_CSE_DAILY_LIMIT}, "
-        f"GitHub {GITHUB_API_HOURLY_LIMIT}"
+        f"GitHub {GITHUB_API_HOURLY_LIMIT} × {max(1, len(github.TOKENS))}"
+        f" token(s)"
     )
 
     # Show any API bans
@@ -578,9 +602,25 @@ def run_batch(techTest=None, analyzers=None):
         )
         print(f"⛔ API limits in effect: {ban_list}")
 
-    print(f"🎯 Processing {batch_size}/{len(due)} techs this run\n")
+    batch = due[:batch_size]
+    selected = [k for k in COLLECTORS if not analyzers or k in analyzers]
 
-    for tech in due[:batch_size]:
+    # Techs the YouTube units left today cannot cover stay due for a later
+    # run instead of getting a snapshot without YouTube data.
+    if "youtube" in selected:
+        postponed = youtube.deferred(batch)
+        if postponed:
+            print(
+                f"⏸️  YouTube budget covers {len(batch) - len(postponed)}"
+                f"/{len(batch)} techs; deferring the rest"
+            )
+            batch = [t for t in batch if t not in postponed]
+
+    print(f"🎯 Processing {len(batch)}/{len(due)} techs this run\n")
+
+    _prepare_batch(batch, selected)
+
+    for tech in batch:
         print(f"🔍 {tech['name']}")
         t0 = time.time()
 
@@ -588,6 +628,7 @@ def run_batch(techTest=None, analyzers=None):
         qualities: Dict[str, float] = {}
         banned_services = []
         active_services = 0
+        deferred = False
 
         # If analyzers specified, only run those
         selected_collectors = COLLECTORS
@@ -602,6 +643,11 @@ def run_batch(techTest=None, analyzers=None):
                 metrics[key] = m
                 qualities[key] = q
                 active_services += 1
+            except youtube.BudgetDeferred as e:
+                deferred = True
+                print(f"   ⏸️  {key} deferred: {e}")
+                break
+
             except APIBanError as e:
                 banned_services.append(key)
                 logger.warning(f"Skipping {key} for {tech['name']}"
@@ -638,6 +684,10 @@ def run_batch(techTest=None, analyzers=None):
                           "Quota will reset at midnight Pacific Time")
                     return
 
+        if deferred:
+            print(f"⏸️  Not saving {tech['name']}; it stays due")
+            continue
+
         # Skip scoring if all services are banned
         count = len(selected_collectors)
         if banned_services and len(banned_services) == count:
@@ -756,10 +806,14 @@ if __name__ == "__main__":
             "this may result in rate limiting or IP bans"
         )
 
-    if args.batch:
-        # Explicitly run batch processing
-        print("\n==== RUNNING BATCH PROCESSING ====")
-        run_batch(analyzers=args.analyzers)
-    else:
-        # Run the full batch process as fallback
-        run_batch(analyzers=args.analyzers)
+    try:
+        if args.batch:
+            # Explicitly run batch processing
+            print("\n==== RUNNING BATCH PROCESSING ====")
+            run_batch(analyzers=args.analyzers)
+        else:
+            # Run the full batch process as fallback
+            run_batch(analyzers=args.analyzers)
+    finally:
+        # Title polarities scored during the run, written once
+        save_sentiment_cache()
@@ -12,6 +12,11 @@ three sources and returns:
 * ``quality`` 1.0 (three signals) · 0.67 (two) · 0.33 (one) · 0.2 (zero)
 * ``raw`` trimmed HTML / sample data for auditability
 
+Pages are parsed with lxml (C parser + compiled XPath) when it is installed,
+otherwise with BeautifulSoup; StackShare pages without the "companies
+reportedly use" blurb are not parsed at all, and the BeautifulSoup path only
+builds the elements the showcase extraction reads.
+
 Public API
 ----------
 ``collect_company_signals(tech: dict[str, str]) -> tuple[dict, float]``
@@ -21,13 +26,24 @@ Public API
 # ───────────────────────── Imports ────────────────────────────
 import logging
 import math
+import os
 import re
-from typing import Any, Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
 
 import bs4
 import requests
 from dotenv import load_dotenv
 
+from packages.cache.store import DiskCache
+
+try:  # optional, several times faster than bs4's html.parser
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # pragma: no cover
+    etree = lxml_html = None
+
 # ---------------------------------------------------------------------------
 # Configuration & globals
 # ---------------------------------------------------------------------------
@@ -39,6 +55,13 @@ TS_BASE = "https://theirstack.com/en/technology"
 MAX_HTML = 10_000  # chars kept per raw source
 TIMEOUT = 12  # seconds for HTTP calls
 
+# Probed showcase URLs are cached per tech name, misses included, so techs
+# without a registry ``showcase_url`` skip the HEAD probes on later runs
+# (``scripts.registry_writeback showcase_url`` copies hits to the registry).
+SHOWCASE_TTL_DAYS = float(os.getenv("SHOWCASE_TTL_DAYS", "90"))
+SHOWCASE_MISS_TTL_DAYS = float(os.getenv("SHOWCASE_MISS_TTL_DAYS", "30"))
+_SHOWCASE_CACHE = DiskCache("showcase_pages")
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -88,7 +111,44 @@ def _guess_domain(slug: str) -> str:
     return special.get(slug, f"{slug}.dev")
 
 
-def get_showcase_url(name: str) -> str:
+def _same_page(url: str, final_url: str) -> bool:
+    """Whether a redirect from *url* still ends on its page – the path may
+    gain a trailing slash or a locale prefix (``/en/showcase``), but a
+    catch-all redirect to the home page or a login page is a miss."""
+    want = urlparse(url).path.rstrip("/").lower()
+    got = urlparse(final_url).path.rstrip("/").lower()
+    return got == want or got.endswith(want)
+
+
+def _probe(url: str) -> Optional[bool]:
+    """Whether *url* answers 200 (after redirects that stay on its page);
+    ``None`` if unknown.
+
+    Servers that refuse HEAD (403 / 405) are asked again with a streamed
+    GET whose body is never read.
+    """
+    try:
+        resp = requests.head(url, headers=HEADERS, timeout=5,
+                             allow_redirects=True)
+        if resp.status_code in (403, 405):
+            with requests.get(url, headers=HEADERS, timeout=5,
+                              stream=True) as resp:
+                pass
+        return resp.status_code == 200 and _same_page(url, resp.url)
+    except Exception:
+        return None
+
+
+def get_showcase_url(name: str) -> Optional[str]:
+    """First showcase-like page answering 200, or ``None``; cached."""
+    key = name.lower()
+    cached = _SHOWCASE_CACHE.get(key, ttl=SHOWCASE_TTL_DAYS * 86_400)
+    if cached is not None and (
+        cached.get("url")
+        or _SHOWCASE_CACHE.age(key) <= SHOWCASE_MISS_TTL_DAYS * 86_400
+    ):
+        return cached.get("url")
+
     slug = _normalize(name)
     domain = _guess_domain(slug)
     patterns = [
@@ -99,15 +159,13 @@ def get_showcase_url(name: str) -> str:
         f"https://{domain}/users",
         f"https://{domain}/whos-using",
     ]
-    for url in patterns:
-        try:
-            if requests.head(url,
-                             headers=HEADERS,
-                             timeout=5).status_code == 200:
-                return url
-        except Exception:
-            continue
-    return patterns[0]
+    with ThreadPoolExecutor(max_workers=len(patterns)) as ex:
+        results = list(ex.map(_probe, patterns))
+    url = next((u for u, ok in zip(patterns, results) if ok), None)
+    if url or None not in results:
+        # a miss is only remembered when every candidate really answered
+        _SHOWCASE_CACHE.set(key, {"url": url})
+    return url
 
 
 def get_their_stack_slug(name: str) -> str:
@@ -115,39 +173,125 @@ def get_their_stack_slug(name: str) -> str:
 
 
 # ---------------------------------------------------------------------------
-#  StackShare helper
+#  HTML extraction
 # ---------------------------------------------------------------------------
 _SS_RE = re.compile(r"companies reportedly use", re.I)
+_HEADING_RE = re.compile(r"[A-Z].*")
+
+if lxml_html is not None:
+    _LXML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+    _NS = {"re": "http://exslt.org/regular-expressions"}
+    _X_BLURB = etree.XPath(
+        "//text()[re:test(., 'companies reportedly use', 'i')]",
+        namespaces=_NS, smart_strings=True,
+    )
+    _X_CARDS = etree.XPath(
+        "//div[contains(concat(' ', normalize-space(@class), ' '),"
+        " ' company-card ')]"
+    )
+    _X_COMPANY_LINKS = etree.XPath("//a[contains(@href, '/company/')]")
+    _X_IMG_ALTS = etree.XPath("//img/@alt")
+    _X_HEADINGS = etree.XPath("//h2 | //h3 | //h4")
+
+
+def _lxml_doc(text: str):
+    return lxml_html.document_fromstring(text.encode("utf-8"),
+                                         parser=_LXML_PARSER)
+
+
+def _joined_text(el) -> str:
+    """lxml equivalent of bs4's ``get_text(" ", strip=True)``."""
+    return " ".join(t.strip() for t in el.itertext() if t.strip())
+
+
+def _ss_lxml(text: str) -> Tuple[int, list[str]]:
+    doc = _lxml_doc(text)
+    blurbs = _X_BLURB(doc)
+    if not blurbs:
+        return 0, []
+    parent = blurbs[0].getparent()
+    if blurbs[0].is_tail:
+        parent = parent.getparent()
+    strongs = [el.text_content() for el in parent.iter("strong")
+               if el is not parent]
+    count = int(strongs[0].strip().replace(",", "")) if strongs else 0
+
+    companies = [t for t in map(_joined_text, _X_CARDS(doc)) if t]
+    if not companies and len(strongs) > 2:
+        companies = [t.strip().rstrip(".,") for t in strongs[2:42]]
+    if not companies:
+        companies = [t for t in (a.text_content().strip()
+                                 for a in _X_COMPANY_LINKS(doc)) if t]
+    return count, companies
+
+
+def _ss_bs4(text: str) -> Tuple[int, list[str]]:
+    soup = bs4.BeautifulSoup(text, "html.parser")
+    blurb = soup.find(string=_SS_RE)
+    if not blurb:
+        return 0, []
+    strongs = blurb.find_parent().find_all("strong")
+    count = int(strongs[0].text.strip().replace(",", "")) if strongs else 0
+
+    companies: list[str] = []
+    for card in soup.find_all("div", class_="company-card"):
+        txt = card.get_text(" ", strip=True)
+        if txt:
+            companies.append(txt)
+    if not companies and strongs and len(strongs) > 2:
+        companies = [s.text.strip().rstrip(".,") for s in strongs[2:42]]
+    if not companies:
+        for link in soup.find_all("a",
+                                  href=lambda h: h and "/company/" in h):
+            txt = link.text.strip()
+            if txt:
+                companies.append(txt)
+    return count, companies
+
+
+def parse_stackshare(text: str) -> Tuple[int, list[str]]:
+    """Company count and up to 40 company names from a StackShare page."""
+    if not _SS_RE.search(text):
+        return 0, []
+    parse = _ss_lxml if lxml_html is not None else _ss_bs4
+    count, companies = parse(text)
+    return count, companies[:40]
+
 
+_SHOWCASE_STRAINER = bs4.SoupStrainer(["img", "h2", "h3", "h4"])
+
+
+def parse_showcase(text: str) -> list[str]:
+    """Sorted candidate company names (logo alts, short headings)."""
+    if not text.strip():
+        return []
+    if lxml_html is not None:
+        doc = _lxml_doc(text)
+        alts = [str(a) for a in _X_IMG_ALTS(doc)]
+        headings = [_joined_text(h) for h in _X_HEADINGS(doc)]
+    else:
+        soup = bs4.BeautifulSoup(text, "html.parser",
+                                 parse_only=_SHOWCASE_STRAINER)
+        alts = [img["alt"] for img in soup.find_all("img", alt=True)]
+        headings = [h.get_text(" ", strip=True)
+                    for h in soup.find_all(["h2", "h3", "h4"])]
+    names = {a.strip() for a in alts if 2 <= len(a.strip()) <= 40}
+    names.update(h for h in headings
+                 if 2 <= len(h) <= 40 and _HEADING_RE.match(h))
+    return sorted(names)
 
+
+# ---------------------------------------------------------------------------
+#  StackShare helper
+# ---------------------------------------------------------------------------
 def _stackshare(slug: str):
     url = f"{SS_BASE}/{slug}"
     try:
         r = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
         if r.status_code != 200:
             return 0, [], ""
-        soup = bs4.BeautifulSoup(r.text, "html.parser")
-        blurb = soup.find(string=_SS_RE)
-        if not blurb:
-            return 0, [], r.text[:MAX_HTML]
-        strongs = blurb.find_parent().find_all("strong")
-        count = int(strongs[0].text.strip().replace(",", "")) if strongs else 0
-
-        companies: list[str] = []
-        for card in soup.find_all("div", class_="company-card"):
-            txt = card.get_text(" ", strip=True)
-            if txt:
-                companies.append(txt)
-        if not companies and strongs and len(strongs) > 2:
-            companies = [s.text.strip().rstrip(".,") for s in strongs[2:42]]
-        if not companies:
-            for link in soup.find_all("a",
-                                      href=lambda h: h and "/company/" in h):
-                txt = link.text.strip()
-                if txt:
-                    companies.append(txt)
-
-        return count, companies[:40], r.text[:MAX_HTML]
+        count, companies = parse_stackshare(r.text)
+        return count, companies, r.text[:MAX_HTML]
     except Exception as exc:
         logger.debug("StackShare error: %s", exc, exc_info=False)
         return 0, [], ""
@@ -161,17 +305,8 @@ def _showcase(url: str):
         r = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
         if r.status_code != 200:
             return 0, [], ""
-        soup = bs4.BeautifulSoup(r.text, "html.parser")
-        names: set[str] = set()
-        for img in soup.find_all("img", alt=True):
-            alt = img["alt"].strip()
-            if 2 <= len(alt) <= 40:
-                names.add(alt)
-        for h in soup.find_all(["h2", "h3", "h4"]):
-            txt = h.get_text(" ", strip=True)
-            if 2 <= len(txt) <= 40 and re.match(r"[A-Z].*", txt):
-                names.add(txt)
-        return len(names), sorted(list(names))[:40], r.text[:MAX_HTML]
+        names = parse_showcase(r.text)
+        return len(names), names[:40], r.text[:MAX_HTML]
     except Exception as exc:
         logger.debug("Showcase error: %s", exc, exc_info=False)
         return 0, [], ""
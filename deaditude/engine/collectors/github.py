@@ -13,7 +13,7 @@ github_collector.py - lean, fault-tolerant GitHub metrics collector (v2)
 
 # ───────────────────────── Imports ────────────────────────────
 import argparse
-import json
+import hashlib
 import logging
 import os
 import time
@@ -26,17 +26,23 @@ import requests
 from dateutil import parser as dtparse
 from dotenv import load_dotenv
 
+from engine.analytics.histogram import AgeHistogram
+from packages.auth.credentials import CredentialPool, env_credentials
+from packages.cache.store import DiskCache
+
 # ───────────────────── Configuration ──────────────────────────
 load_dotenv()
 
 GQL_ENDPOINT = "https://api.github.com/graphql"
 REST_ROOT = "https://api.github.com"
-TOKEN: str | None = os.getenv("DEAD_GITHUB_PAT")
+# DEAD_GITHUB_PATS (comma-separated) and/or the legacy DEAD_GITHUB_PAT
+TOKENS: list[str] = env_credentials("DEAD_GITHUB_PATS", "DEAD_GITHUB_PAT")
 
 logger = logging.getLogger(__name__)
 
-HEADERS_GQL = {"Authorization": f"Bearer {TOKEN}"} if TOKEN else {}
-HEADERS_REST = {"Authorization": f"token {TOKEN}"} if TOKEN else {}
+# GraphQL points and REST requests are separate budgets per token.
+_GQL_POOL = CredentialPool("github-graphql", TOKENS, limit=5000)
+_REST_POOL = CredentialPool("github-rest", TOKENS, limit=5000)
 
 sess: requests.Session = requests.Session()
 sess.headers.update({"User-Agent": "deaditude-bot/3.1"})
@@ -45,6 +51,15 @@ _TIMEOUT = 12
 _RETRY_STATUS: set[int] = {502, 503, 504, 403}
 _MAX_RETRIES = 4
 
+AGE_PAGE_SIZE = 100  # GraphQL connection maximum
+AGE_NODE_BUDGET = int(os.getenv("GITHUB_AGE_NODE_BUDGET", "500"))
+AGE_QUANTILE_TOLERANCE = 0.05  # relative p50/p90 drift that counts as stable
+
+PROFILE_TTL_DAYS = float(os.getenv("GITHUB_PROFILE_TTL_DAYS", "7"))
+_PROFILE_CACHE = DiskCache("github_profile")
+
+ETAG_TTL_DAYS = float(os.getenv("GITHUB_ETAG_TTL_DAYS", "14"))
+
 # ───────────────────── Scoring constants ──────────────────────
 BASE_SCORE = 5.0  # neutral baseline
 
@@ -91,12 +106,86 @@ COMMIT_WINDOW_DAYS = 30
 
 
 # ───────────────────────── Helpers ────────────────────────────
+# GitHub does not charge 304 Not Modified against the REST rate limit, so every
+# successful GET is remembered with its validators and replayed on the next run
+# with If-None-Match / If-Modified-Since.  ETags vary with Authorization, so
+# entries are keyed per token; entries older than ETAG_TTL_DAYS are dropped
+# when their shard is first opened.
+_ETAG_SHARDS: dict[str, DiskCache] = {}
+
+
+def _etag_cache(url: str) -> DiskCache:
+    shard = hashlib.sha1(url.encode()).hexdigest()[:2]
+    if shard not in _ETAG_SHARDS:
+        cache = DiskCache(f"github_etags/{shard}")
+        ttl = ETAG_TTL_DAYS * 86_400
+        cache.delete_many([
+            k for k, _ in cache.items() if (cache.age(k) or 0) > ttl
+        ])
+        _ETAG_SHARDS[shard] = cache
+    return _ETAG_SHARDS[shard]
+
+
+def _etag_key(url: str, token: Optional[str]) -> str:
+    who = hashlib.sha1(token.encode()).hexdigest()[:10] if token else "anon"
+    return f"{who} {url}"
+
+
+def _track_budget(pool: CredentialPool, token: Optional[str],
+                  resp: requests.Response) -> None:
+    """Feed X-RateLimit-* headers back into *pool* for *token*."""
+    hdr = resp.headers
+    try:
+        remaining = int(hdr["X-RateLimit-Remaining"])
+        reset_at = float(hdr.get("X-RateLimit-Reset", 0)) or None
+        limit = int(hdr.get("X-RateLimit-Limit", 0)) or None
+    except (KeyError, ValueError):
+        return
+    pool.update(token, remaining, reset_at=reset_at, limit=limit)
+
+
+def _replay(url: str, body: str) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = url
+    resp.encoding = "utf-8"
+    resp._content = body.encode("utf-8")
+    resp.headers["X-Deaditude-Cache"] = "revalidated"
+    return resp
+
+
 def _get(url: str, **kwargs) -> requests.Response:
-    """HTTP GET with exponential back‑off."""
+    """HTTP GET with exponential back‑off and ETag revalidation."""
+    full_url = requests.Request("GET", url,
+                                params=kwargs.get("params")).prepare().url
+    cache = _etag_cache(full_url)
+    base_headers = dict(kwargs.pop("headers", None) or {})
+
     delay = 1.0
     for attempt in range(_MAX_RETRIES):
-        resp = sess.get(url, timeout=_TIMEOUT, **kwargs)
+        token = _REST_POOL.acquire()
+        key = _etag_key(full_url, token)
+        cached = cache.get(key, ttl=ETAG_TTL_DAYS * 86_400)
+        headers = dict(base_headers)
+        if token:
+            headers["Authorization"] = f"token {token}"
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        resp = sess.get(url, timeout=_TIMEOUT, headers=headers, **kwargs)
+        _track_budget(_REST_POOL, token, resp)
+        if resp.status_code == 304 and cached:
+            logger.debug("%s – 304, serving cached body", url)
+            return _replay(url, cached["body"])
         if resp.status_code not in _RETRY_STATUS:
+            validators = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            }
+            if resp.status_code == 200 and any(validators.values()):
+                cache.set(key, {**validators, "body": resp.text})
             return resp
         logger.debug(
             "%s – retry %d/%d (status %s)",
@@ -111,16 +200,25 @@ def _get(url: str, **kwargs) -> requests.Response:
     return resp  # for type checkers
 
 
-_GQL_QUERY = """
-query RepoOverview($owner:String!,$repo:String!,$sinceISO:GitTimestamp!){
+# Volatile core – changes daily, fetched on every run.
+_GQL_CORE_QUERY = """
+query RepoCore($owner:String!,$repo:String!,$sinceISO:GitTimestamp!){
   repository(owner:$owner,name:$repo){
     name stargazerCount forkCount watchers{totalCount}
     issuesCount: issues(states:OPEN){totalCount}
     pullRequestsCount: pullRequests(states:OPEN){totalCount}
-    refs(refPrefix:"refs/tags/"){totalCount}
     defaultBranchRef{
       target{... on Commit{history(since:$sinceISO){totalCount}}}
     }
+  }
+}""".strip()
+
+# Static profile – languages, topics, tags & latest release barely move,
+# so they are cached for PROFILE_TTL_DAYS and merged into the core metrics.
+_GQL_PROFILE_QUERY = """
+query RepoProfile($owner:String!,$repo:String!){
+  repository(owner:$owner,name:$repo){
+    refs(refPrefix:"refs/tags/"){totalCount}
     languages(first:10,orderBy:{field:SIZE,direction:DESC}){
       edges{node{name}size}
     }
@@ -130,36 +228,219 @@ query RepoOverview($owner:String!,$repo:String!,$sinceISO:GitTimestamp!){
     releases(first:1,orderBy:{field:CREATED_AT,direction:DESC}){
       nodes{tagName createdAt}
     }
-    issuesDetails: issues(
-      first:50,
-      states:OPEN,
-      orderBy:{field:CREATED_AT,direction:ASC}
-    ){
-      nodes{createdAt}
-    }
-    pullRequestsDetails: pullRequests(
-      first:50,
-      states:OPEN,
-      orderBy:{field:CREATED_AT,direction:ASC}
-    ){
-      nodes{createdAt}
-    }
   }
 }""".strip()
 
 
-def _run_gql(variables: Dict[str, str]) -> Mapping[str, Any]:
+def _run_gql(query: str, variables: Dict[str, str]) -> Mapping[str, Any]:
+    token = _GQL_POOL.acquire()
     resp = sess.post(
         GQL_ENDPOINT,
-        json={"query": _GQL_QUERY, "variables": variables},
-        headers=HEADERS_GQL,
+        json={"query": query, "variables": variables},
+        headers={"Authorization": f"Bearer {token}"} if token else {},
         timeout=20,
     )
+    _track_budget(_GQL_POOL, token, resp)
     if resp.status_code == 200:
         return resp.json()
     raise RuntimeError(f"GraphQL {resp.status_code}: {resp.text[:120]}")
 
 
+# Open issue / PR ages are streamed page by page from both ends of the
+# creation-date ordering.  Every node is folded into an AgeHistogram and then
+# dropped; the unseen middle of the listing is known to lie between the two
+# frontiers, so streaming stops as soon as that band fits in one bucket, the
+# quantiles stop moving, or the node budget is spent.
+_AGE_CONN = """
+    {alias}: {conn}(first:{first},after:${alias},states:OPEN,
+      orderBy:{{field:CREATED_AT,direction:{direction}}}){{
+      pageInfo{{hasNextPage endCursor}} nodes{{createdAt}}
+    }}"""
+
+
+class _AgeStream:
+    """Two-ended cursor walk over one OPEN connection (issues or PRs)."""
+
+    def __init__(self, conn: str, total: int, now: datetime):
+        self.conn = conn
+        self.total = total
+        self.now = now
+        self.hist = AgeHistogram()
+        self.seen = 0
+        self.cursors: dict[str, Optional[str]] = {"ASC": None, "DESC": None}
+        self.more = {"ASC": total > 0, "DESC": total > 0}
+        # ASC walks oldest → newest, DESC newest → oldest; the unseen items
+        # are younger than the ASC frontier and older than the DESC one.
+        self.front = {"ASC": None, "DESC": 0.0}
+        self.last_q: Optional[tuple] = None
+        self.done = total == 0
+
+    @property
+    def unseen(self) -> int:
+        return max(0, self.total - self.seen)
+
+    def band(self) -> tuple[float, float]:
+        lo = self.front["DESC"] or 0.0
+        hi = self.front["ASC"] if self.front["ASC"] is not None else lo
+        return lo, max(lo, hi)
+
+    def estimate(self) -> AgeHistogram:
+        return self.hist.with_pending(self.unseen, *self.band())
+
+    def plan(self, budget_left: int) -> list[tuple[str, str, int]]:
+        """Aliases, directions and page sizes for the next round."""
+        want = min(self.unseen, budget_left)
+        if self.done or want <= 0:
+            return []
+        asc = min(AGE_PAGE_SIZE, -(-want // 2)) if self.more["ASC"] else 0
+        desc = min(AGE_PAGE_SIZE, want - asc) if self.more["DESC"] else 0
+        if not self.more["DESC"]:
+            asc = min(AGE_PAGE_SIZE, want)
+        out = []
+        if asc:
+            out.append((f"{self.conn}ASC", "ASC", asc))
+        if desc:
+            out.append((f"{self.conn}DESC", "DESC", desc))
+        return out
+
+    def feed(self, direction: str, page: Mapping[str, Any]) -> None:
+        ages = [
+            (self.now -
+             dtparse.isoparse(n["createdAt"]).astimezone(timezone.utc)).days
+            for n in page.get("nodes") or []
+        ]
+        self.hist.add_many(ages)
+        self.seen += len(ages)
+        if ages:
+            self.front[direction] = ages[-1]
+        info = page.get("pageInfo") or {}
+        self.cursors[direction] = info.get("endCursor")
+        self.more[direction] = bool(info.get("hasNextPage")) and bool(ages)
+
+    def settle(self, budget_left: int) -> None:
+        """Mark the stream done once more pages cannot change the picture."""
+        if self.done:
+            return
+        lo, hi = self.band()
+        if (
+            self.unseen == 0
+            or not (self.more["ASC"] or self.more["DESC"])
+            or budget_left <= 0
+            or self.hist.bucket(lo) == self.hist.bucket(hi)
+        ):
+            self.done = True
+            return
+        est = self.estimate()
+        q = (est.quantile(0.5) or 0.0, est.quantile(0.9) or 0.0)
+        if self.last_q is not None and all(
+            abs(a - b) <= max(1.0, AGE_QUANTILE_TOLERANCE * b)
+            for a, b in zip(q, self.last_q)
+        ):
+            self.done = True
+        self.last_q = q
+
+    def summary(self) -> dict[str, Any]:
+        out = self.estimate().summary()
+        out.update({"total": self.total, "sampled": self.seen,
+                    "exact": self.unseen == 0})
+        return out
+
+
+def _age_query(plan: list[tuple[str, str, str, int]]) -> str:
+    decl = "".join(f",${alias}:String" for alias, _, _, _ in plan)
+    body = "".join(
+        _AGE_CONN.format(alias=alias, conn=conn, first=first,
+                         direction=direction)
+        for alias, conn, direction, first in plan
+    )
+    return (
+        f"query RepoAges($owner:String!,$repo:String!{decl}){{\n"
+        f"  repository(owner:$owner,name:$repo){{{body}\n  }}\n}}"
+    )
+
+
+def _stream_ages(owner: str, repo: str, totals: dict[str, int],
+                 now: datetime) -> dict[str, dict[str, Any]]:
+    """Age summaries for the OPEN *totals* connections, within budget."""
+    streams = {c: _AgeStream(c, n, now) for c, n in totals.items()}
+    spent = {c: 0 for c in streams}
+    while True:
+        plan = [
+            (alias, st.conn, direction, first)
+            for st in streams.values()
+            for alias, direction, first in st.plan(AGE_NODE_BUDGET -
+                                                   spent[st.conn])
+        ]
+        if not plan:
+            break
+        variables: dict[str, Any] = {"owner": owner, "repo": repo}
+        for alias, conn, direction, _ in plan:
+            variables[alias] = streams[conn].cursors[direction]
+        raw = _run_gql(_age_query(plan), variables)
+        repo_data = (raw.get("data") or {}).get("repository")
+        if raw.get("errors") or not repo_data:
+            raise RuntimeError(f"age query errors: {raw.get('errors')}")
+        for alias, conn, direction, first in plan:
+            streams[conn].feed(direction, repo_data.get(alias) or {})
+            spent[conn] += first
+        for st in streams.values():
+            st.settle(AGE_NODE_BUDGET - spent[st.conn])
+    return {c: st.summary() for c, st in streams.items()}
+
+
+# Stand-in when the profile query fails and nothing is cached;
+# ``tags_count`` None marks the profile as unknown for scoring.
+_EMPTY_PROFILE: dict[str, Any] = {
+    "tags_count": None,
+    "latest_tag_name": None,
+    "latest_tag_date": None,
+    "languages": [],
+    "topics": [],
+}
+
+
+def _parse_profile(repo_data: Mapping[str, Any]) -> dict[str, Any]:
+    rels = repo_data["releases"]["nodes"]
+    lang_edges = repo_data["languages"]["edges"]
+    total_size = sum(e["size"] for e in lang_edges) or 1
+    return {
+        "tags_count": repo_data["refs"]["totalCount"],
+        "latest_tag_name": rels[0].get("tagName") if rels else None,
+        "latest_tag_date": rels[0].get("createdAt") if rels else None,
+        "languages": [
+            {
+                "name": e["node"]["name"],
+                "percentage": round(e["size"] * 100 / total_size, 2),
+            }
+            for e in lang_edges
+        ],
+        "topics": [
+            n["topic"]["name"] for n in repo_data["repositoryTopics"]["nodes"]
+        ],
+    }
+
+
+def _repo_profile(owner: str, repo: str) -> dict[str, Any]:
+    """Static repo fields, served from the disk cache while fresh."""
+    key = f"{owner}/{repo}"
+    cached = _PROFILE_CACHE.get(key, ttl=PROFILE_TTL_DAYS * 86_400)
+    if cached is not None:
+        logger.debug("Profile cache hit for %s", key)
+        return cached
+    try:
+        raw = _run_gql(_GQL_PROFILE_QUERY, {"owner": owner, "repo": repo})
+        repo_data = (raw.get("data") or {}).get("repository")
+        if raw.get("errors") or not repo_data:
+            raise RuntimeError(f"profile query errors: {raw.get('errors')}")
+        profile = _parse_profile(repo_data)
+    except Exception as exc:
+        # A stale profile beats none at all – these fields rarely change.
+        logger.debug("Profile fetch failed for %s: %s", key, exc)
+        return _PROFILE_CACHE.get(key) or dict(_EMPTY_PROFILE)
+    _PROFILE_CACHE.set(key, profile)
+    return profile
+
+
 _STAT_CACHE: dict[str, Any] = {}
 
 
@@ -169,8 +450,7 @@ def _rest_stats(owner: str, repo: str) -> dict[str, Any]:
         return _STAT_CACHE[key]
     out: dict[str, Any] = {}
     for ep in ("participation", "contributors"):
-        res = _get(f"{REST_ROOT}/repos/{owner}/{repo}/stats/{ep}",
-                   headers=HEADERS_REST)
+        res = _get(f"{REST_ROOT}/repos/{owner}/{repo}/stats/{ep}")
         if res.status_code == 200:
             out[ep] = res.json()
     _STAT_CACHE[key] = out
@@ -193,7 +473,8 @@ def collect_repo_metrics(
     since_iso = (now - timedelta(days=COMMIT_WINDOW_DAYS)).isoformat()
 
     try:
-        gql_raw = _run_gql({"owner": owner,
+        gql_raw = _run_gql(_GQL_CORE_QUERY,
+                           {"owner": owner,
                             "repo": repo,
                             "sinceISO": since_iso,
                             })
@@ -216,55 +497,31 @@ def collect_repo_metrics(
         "watchers": repo_data["watchers"]["totalCount"],
         "open_issues": repo_data["issuesCount"]["totalCount"],
         "open_prs": repo_data["pullRequestsCount"]["totalCount"],
-        "tags_count": repo_data["refs"]["totalCount"],
         "commits_last_30d": repo_data["defaultBranchRef"]["target"]["history"][
             "totalCount"
         ],
     }
 
-    # Latest release
-    rels = repo_data["releases"]["nodes"]
-    if rels:
-        metrics["latest_tag_name"] = rels[0].get("tagName")
-        metrics["latest_tag_date"] = rels[0].get("createdAt")
-    else:
-        metrics["latest_tag_name"] = metrics["latest_tag_date"] = None
+    # Static profile: tags, latest release, languages, topics
+    metrics.update(_repo_profile(owner, repo))
 
-    # Languages
-    lang_edges = repo_data["languages"]["edges"]
-    total_size = sum(e["size"] for e in lang_edges) or 1
-    metrics["languages"] = [
-        {
-            "name": e["node"]["name"],
-            "percentage": round(e["size"] * 100 / total_size, 2),
-        }
-        for e in lang_edges
-    ]
-
-    # Topics
-    metrics["topics"] = [
-        n["topic"]["name"] for n in repo_data["repositoryTopics"]["nodes"]
-    ]
-
-    # Age helpers
-    def _age(nodes: list[dict[str, Any]]) -> dict[str, Any]:
-        ages = [
-            (now -
-             dtparse.isoparse(n["createdAt"]).astimezone(timezone.utc)).days
-            for n in nodes
-        ]
-        if not ages:
-            return {"avg": None, "oldest": None, "30d": 0, "90d": 0, "365d": 0}
-        return {
-            "avg": sum(ages) / len(ages),
-            "oldest": max(ages),
-            "30d": sum(a >= 30 for a in ages),
-            "90d": sum(a >= 90 for a in ages),
-            "365d": sum(a >= 365 for a in ages),
-        }
-
-    metrics["issue_age_metrics"] = _age(repo_data["issuesDetails"]["nodes"])
-    metrics["pr_age_metrics"] = _age(repo_data["pullRequestsDetails"]["nodes"])
+    # Issue / PR ages (streamed, constant memory)
+    try:
+        ages = _stream_ages(
+            owner,
+            repo,
+            {
+                "issues": metrics["open_issues"],
+                "pullRequests": metrics["open_prs"],
+            },
+            now,
+        )
+    except Exception as exc:
+        logger.debug("Age streaming failed: %s", exc)
+        ages = {}
+    empty_age = AgeHistogram().summary()
+    metrics["issue_age_metrics"] = ages.get("issues", empty_age)
+    metrics["pr_age_metrics"] = ages.get("pullRequests", empty_age)
 
     # REST stats
     rest_raw = _rest_stats(owner, repo)
@@ -272,7 +529,7 @@ def collect_repo_metrics(
 
     # Raw payloads
     metrics["raw"] = {
-        "graphql": json.dumps(gql_raw)[:10_000],
+        "graphql": gql_raw,
         "rest_stats": rest_raw,
     }
 
@@ -280,6 +537,8 @@ def collect_repo_metrics(
     metrics["deaditude_score"] = _calculate_deaditude(metrics)
 
     quality = 1.0 if rest_raw.get("contributors") else 0.6
+    if metrics["tags_count"] is None:
+        quality = min(quality, 0.6)
     return metrics, quality
 
 
@@ -316,7 +575,9 @@ def _calculate_deaditude(metrics: Dict[str, Any]) -> float:  # noqa: C901
                 score += RELEASE_MED_OLD_PENALTY
         except Exception:
             score += RELEASE_PARSE_ERROR_PENALTY
-    else:
+    elif metrics.get("tags_count") is not None:
+        # No release at all.  With an unknown profile (profile query failed,
+        # nothing cached: tags_count is None) the release is not judged.
         score += RELEASE_NONE_PENALTY
 
     # Positive signals
@@ -348,7 +609,7 @@ def _calculate_deaditude(metrics: Dict[str, Any]) -> float:  # noqa: C901
 def _rest_fallback(owner: str, repo: str) -> Tuple[Dict[str, Any], float]:
     logger.debug("REST fallback for %s/%s", owner, repo)
     try:
-        r = _get(f"{REST_ROOT}/repos/{owner}/{repo}", headers=HEADERS_REST)
+        r = _get(f"{REST_ROOT}/repos/{owner}/{repo}")
         if r.status_code != 200:
             raise RuntimeError(
                 f"REST fallback failed: {r.status_code} – {r.text[:100]}"
@@ -4,7 +4,18 @@ from __future__ import annotations
 ===================
 Hacker News signal collector (v2).
 
-* ``collect_hn_signals(tech_name) -> (metrics, quality)``
+Every story of the window is pulled once – incrementally from the newest
+story of the last run, the whole window on the first run – into a local
+store, and all tech names and aliases are matched against the titles in a
+single pass, so the number of HN requests does not grow with the registry.
+A tech counts every story whose title mentions it as a whole word; volume,
+weekly trend and averages are all computed over those stories.  Each
+completed week of the store is checked once against Algolia's exact story
+total for it (a count-only ``hitsPerPage=0`` query) and pulled again if
+stories are missing, so the counts are not skewed by a gap in the store.
+
+* ``prepare_batch(techs)`` – match a whole batch at once
+* ``collect_hn_signals(tech | tech_name) -> (metrics, quality)``
 * CLI: ``python hn_collector.py <tech> [-v | --verbose]``
 """
 
@@ -14,26 +25,46 @@ import json
 import logging
 import os
 import time
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Tuple
 
 import requests
 from dotenv import load_dotenv
 
+from engine.analytics.matcher import TermMatcher, tech_aliases
+from engine.analytics.trends import series_trend
+from packages.cache.store import DiskCache
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 
 load_dotenv()
 
-BASE_URL = "https://hn.algolia.com/api/v1/search"
+API_ROOT = "https://hn.algolia.com/api/v1"
+BY_DATE_URL = f"{API_ROOT}/search_by_date"
 HEADERS = {"User-Agent": "deaditude-hn-collector/2.0"}
 WINDOW_DAYS = int(os.getenv("HN_WINDOW_DAYS", "120"))
-MAX_HITS = int(os.getenv("HN_MAX_HITS", "300"))
+STORY_ATTRIBUTES = "title,points,num_comments,created_at_i"
+WEEK_SECONDS = 7 * 86_400
+TREND_WEEKS = max(1, WINDOW_DAYS // 7)
+TREND_PERIODS = 3
 RETRY_LIMIT = 4
 
 logger = logging.getLogger(__name__)
 
+# Stories of the last HN_SCAN_REFRESH_HOURS are pulled again on every run
+# so their points / comments settle.
+SCAN_REFRESH_HOURS = float(os.getenv("HN_SCAN_REFRESH_HOURS", "48"))
+SCAN_PAGE = 1000  # Algolia's hard cap on hits per query
+# "hwm" -> newest created_at_i seen,
+# "w<week start>" -> {objectID: [created_at_i, points, comments, title]}
+_STORIES = DiskCache("hn_stories")
+# "w<week start>" -> stories Algolia reports for that completed week
+_WEEK_TOTALS = DiskCache("hn_week_totals")
+_MATCHES: Dict[str, List[dict]] = {}
+_synced = False  # store brought up to date in this process
+
 # ---------------------------------------------------------------------------
 # Scoring constants (unchanged)
 # ---------------------------------------------------------------------------
@@ -56,17 +87,11 @@ MED_QUALITY_THRESHOLD = 3
 # ---------------------------------------------------------------------------
 
 
-def _fetch_page(term: str, page: int, epoch_cutoff: int) -> Dict[str, Any]:
-    params = {
-        "query": term,
-        "tags": "story",
-        "hitsPerPage": 1000,
-        "page": page,
-        "numericFilters": f"created_at_i>{epoch_cutoff}",
-    }
+def _search(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    params = {"tags": "story", **params}
     delay = 1.0
     for attempt in range(RETRY_LIMIT):
-        resp = requests.get(BASE_URL,
+        resp = requests.get(url,
                             params=params,
                             headers=HEADERS,
                             timeout=12)
@@ -85,48 +110,205 @@ def _fetch_page(term: str, page: int, epoch_cutoff: int) -> Dict[str, Any]:
     raise RuntimeError(f"HN API failed: {resp.status_code}")
 
 
+def _window_start(now: int) -> int:
+    return (now // WEEK_SECONDS - TREND_WEEKS) * WEEK_SECONDS
+
+
+def _bucket_weeks(timestamps: List[int], now: int) -> Tuple[List[int], int]:
+    """Stories per completed week for the last TREND_WEEKS weeks, oldest
+    first, plus the count of the current, unfinished week."""
+    first = _window_start(now)
+    end = first + TREND_WEEKS * WEEK_SECONDS
+    weekly = [0] * TREND_WEEKS
+    this_week = 0
+    for ts in timestamps:
+        if ts >= end:
+            this_week += 1
+        elif ts >= first:
+            weekly[(ts - first) // WEEK_SECONDS] += 1
+    return weekly, this_week
+
+
+# ---------------------------------------------------------------------------
+# Story store (batch mode)
+# ---------------------------------------------------------------------------
+
+
+def _pull_stories(after: int, until: int) -> Dict[str, list]:
+    """Every story created in ``(after, until]``, paged newest first by
+    lowering the upper ``created_at_i`` bound."""
+    out: Dict[str, list] = {}
+    upper = until
+    while True:
+        js = _search(BY_DATE_URL, {
+            "hitsPerPage": SCAN_PAGE,
+            "numericFilters": f"created_at_i>{after},created_at_i<={upper}",
+            "attributesToRetrieve": STORY_ATTRIBUTES,
+            "attributesToHighlight": "",
+        })
+        hits = js.get("hits", [])
+        new = [h for h in hits if h["objectID"] not in out]
+        for h in new:
+            out[h["objectID"]] = [
+                h.get("created_at_i", 0),
+                h.get("points") or 0,
+                h.get("num_comments") or 0,
+                h.get("title") or "",
+            ]
+        if len(hits) < SCAN_PAGE or not new:
+            return out
+        upper = min(h.get("created_at_i", 0) for h in hits)
+
+
+def _week_total(start: int) -> int:
+    """Stories Algolia holds for the week starting at *start*; a
+    ``hitsPerPage=0`` query, so only ``nbHits`` comes back."""
+    js = _search(BY_DATE_URL, {
+        "hitsPerPage": 0,
+        "numericFilters": (f"created_at_i>={start},"
+                           f"created_at_i<{start + WEEK_SECONDS}"),
+    })
+    return int(js.get("nbHits") or 0)
+
+
+def _sync_stories(now: int) -> None:
+    """Bring the story store up to *now*, pull completed weeks again that
+    hold fewer stories than Algolia's total for them, and drop weeks
+    before the window."""
+    since = _window_start(now)
+    hwm = _STORIES.get("hwm") or since
+    after = max(since, hwm - int(SCAN_REFRESH_HOURS * 3600))
+    pulled = _pull_stories(after, now)
+
+    updates: Dict[str, Any] = {}
+
+    def add(recs: Dict[str, list]) -> None:
+        for sid, rec in recs.items():
+            key = f"w{rec[0] // WEEK_SECONDS * WEEK_SECONDS}"
+            if key not in updates:
+                updates[key] = _STORIES.get(key) or {}
+            updates[key][sid] = rec
+
+    add(pulled)
+    updates["hwm"] = max([hwm] + [rec[0] for rec in pulled.values()])
+
+    totals: Dict[str, int] = {}
+    backfilled = 0
+    for start in range(since, now // WEEK_SECONDS * WEEK_SECONDS,
+                       WEEK_SECONDS):
+        key = f"w{start}"
+        if _WEEK_TOTALS.get(key) is not None:
+            continue
+        total = _week_total(start)
+        stored = len(updates.get(key) or _STORIES.get(key) or {})
+        if stored < total:
+            recs = _pull_stories(start - 1, start + WEEK_SECONDS - 1)
+            backfilled += len(recs)
+            add(recs)
+        totals[key] = total
+
+    def expired(cache: DiskCache) -> List[str]:
+        return [
+            key for key, _ in cache.items()
+            if key.startswith("w") and int(key[1:]) + WEEK_SECONDS <= since
+        ]
+
+    _STORIES.set_many(updates, drop=expired(_STORIES))
+    _WEEK_TOTALS.set_many(totals, drop=expired(_WEEK_TOTALS))
+    logger.debug("HN store: %d stories pulled since %d, %d backfilled",
+                 len(pulled), after, backfilled)
+
+
+def prepare_batch(techs: List[Dict[str, Any]]) -> None:
+    """Match every tech of the batch against the stored story titles."""
+    global _synced
+    now = int(time.time())
+    if not _synced:
+        _sync_stories(now)
+        _synced = True
+    terms = {
+        (t if isinstance(t, str) else t["name"]).lower(): tech_aliases(t)
+        for t in techs
+    }
+    matcher = TermMatcher(terms)
+    matches: Dict[str, List[dict]] = {key: [] for key in terms}
+    since = _window_start(now)
+    for key, week in _STORIES.items():
+        if not key.startswith("w"):
+            continue
+        for sid, (ts, points, comments, title) in week.items():
+            if ts < since:
+                continue
+            for tech in matcher.find(title):
+                matches[tech].append({
+                    "objectID": sid,
+                    "title": title,
+                    "points": points,
+                    "num_comments": comments,
+                    "created_at_i": ts,
+                })
+    for hits in matches.values():
+        hits.sort(key=lambda h: h["created_at_i"], reverse=True)
+    _MATCHES.update(matches)
+
+
+def _analyze_trend(weekly: List[int]) -> Dict[str, Any]:
+    if not any(weekly):
+        return {
+            "trend_direction": "insufficient_data",
+            "growth_rate": 0,
+            "period_counts": [],
+            "weekly_counts": weekly,
+        }
+    tr = series_trend(weekly, periods=TREND_PERIODS, rule="endpoints")
+    return {
+        "trend_direction": tr["direction"],
+        "growth_rate": tr["growth"],
+        "trend_slope": tr["slope"],  # stories/week, per week
+        "period_counts": tr["counts"],
+        "weekly_counts": weekly,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Collector
 # ---------------------------------------------------------------------------
 
-__all__ = ["collect_hn_signals"]
+__all__ = ["collect_hn_signals", "prepare_batch"]
 
 
-def collect_hn_signals(tech_name: str) -> Tuple[Dict[str, Any], float]:
-    """Collect Hacker News activity metrics for *tech_name*."""
+def collect_hn_signals(tech) -> Tuple[Dict[str, Any], float]:
+    """Collect Hacker News activity metrics for a registry *tech* (or
+    just its name)."""
+    tech_name = tech if isinstance(tech, str) else tech["name"]
     logger.debug("Analyzing %s on HN", tech_name)
     now = datetime.utcnow().replace(tzinfo=timezone.utc)
-    epoch_cutoff = int((now - timedelta(days=WINDOW_DAYS)).timestamp())
-
-    all_hits: List[dict] = []
-    page = 0
-    while True:
-        js = _fetch_page(tech_name, page, epoch_cutoff)
-        hits = js.get("hits", [])
-        all_hits.extend(hits)
-        if page >= js.get("nbPages", 0) - 1:
-            break
-        if len(all_hits) >= MAX_HITS:
-            break
-        page += 1
-        time.sleep(0.25)
-
-    post_count = len(all_hits)
+    now_ts = int(now.timestamp())
+    if tech_name.lower() not in _MATCHES:
+        prepare_batch([tech])
+    hits = _MATCHES[tech_name.lower()]
+    weekly, this_week = _bucket_weeks([h["created_at_i"] for h in hits],
+                                      now_ts)
+    trend_metrics = _analyze_trend(weekly)
+    post_count = sum(weekly) + this_week
     if post_count == 0:
         metrics = {
             "post_count": 0,
             "avg_points": 0,
+            "avg_comments": 0,
             "days_since_last_post": None,
             "recent_within_7": False,
+            "trend_direction": trend_metrics["trend_direction"],
+            "trend_metrics": trend_metrics,
             "raw": {"hits": []},
             "deaditude_score": 10.0,
         }
         return metrics, 0.3
 
-    points = [h.get("points", 0) for h in all_hits]
-    avg_points = sum(points) / post_count if points else 0
+    latest_ts = hits[0]["created_at_i"]
+    avg_points = sum(h["points"] for h in hits) / len(hits)
+    avg_comments = sum(h["num_comments"] for h in hits) / len(hits)
 
-    latest_ts = max(h.get("created_at_i", 0) for h in all_hits)
     days_since = (now -
                   datetime.fromtimestamp(latest_ts, tz=timezone.utc)).days
     recent_7 = days_since <= RECENT_DAYS_THRESHOLD
@@ -158,10 +340,13 @@ def collect_hn_signals(tech_name: str) -> Tuple[Dict[str, Any], float]:
     metrics = {
         "post_count": post_count,
         "avg_points": round(avg_points, 2),
+        "avg_comments": round(avg_comments, 2),
         "days_since_last_post": days_since,
         "recent_within_7": recent_7,
+        "trend_direction": trend_metrics["trend_direction"],
+        "trend_metrics": trend_metrics,
         "deaditude_score": deaditude,
-        "raw": {"hits": all_hits[:50]},
+        "raw": {"hits": hits[:50]},
         "score_components": {
             "volume_score": round(vol_score, 2),
             "karma_score": round(karma_score, 2),
@@ -170,10 +355,12 @@ def collect_hn_signals(tech_name: str) -> Tuple[Dict[str, Any], float]:
     }
 
     logger.debug(
-        "HN → %s: posts=%d avg_pts=%.1f deaditude=%.2f quality=%.1f",
+        "HN → %s: posts=%d avg_pts=%.1f trend=%s deaditude=%.2f "
+        "quality=%.1f",
         tech_name,
         post_count,
         avg_points,
+        trend_metrics["trend_direction"],
         deaditude,
         quality,
     )
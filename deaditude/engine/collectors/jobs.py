@@ -4,8 +4,13 @@ from __future__ import annotations
 ====================
 Collect current job openings signal for a programming language / framework.
 
-*   Primary source **Adzuna REST v1** across a configurable country list.
-*   Fallback - Google Custom Search scrape.
+*   Primary source **Adzuna REST v1** across a configurable country list,
+    queried concurrently; ``(term, country)`` counts are cached for
+    ``ADZ_CACHE_TTL_HOURS``.
+*   Trend - month-over-month direction / growth of those counts, kept per
+    term in a small monthly history (closed months never change).
+*   Fallback - Google Custom Search scrape, metered against
+    ``GOOGLE_CSE_DAILY_LIMIT`` by a persisted daily ledger.
 *   Returns``(metrics, quality)``
 CLI usage
 ~~~~~~~~~
@@ -15,17 +20,23 @@ python jobs_collector.py <tech-term> [-v | --verbose]
 """
 
 from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Any, Dict, Tuple
+from zoneinfo import ZoneInfo
 import argparse
 import json
 import logging
 import os
 import re
-import time
+import threading
 
 import requests
 from dotenv import load_dotenv
 
+from engine.analytics.trends import series_trend
+from packages.cache.store import DiskCache
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -37,14 +48,31 @@ ADZ_APP_KEY: str | None = os.getenv("ADZUNA_APP_KEY")
 ADZ_COUNTRIES: list[str] = os.getenv("ADZ_COUNTRIES",
                                      "us,gb,ca,fr,de,in").split(",")
 
+# All countries hit api.adzuna.com, so this is the per-host limit
+ADZ_CONCURRENCY = int(os.getenv("ADZ_CONCURRENCY", "3"))
+# Totals barely move within a day
+CACHE_TTL_HOURS = float(os.getenv("ADZ_CACHE_TTL_HOURS", "24"))
+
 GOOGLE_API_KEY: str | None = os.getenv("GOOGLE_API_KEY")
 CSE_ID: str | None = os.getenv("SEARCH_ENGINE_ID")
+GOOGLE_CSE_DAILY_LIMIT = int(os.getenv("GOOGLE_CSE_DAILY_LIMIT", "100"))
 
 HEADERS = {"User-Agent": "deaditude-jobs-collector/2.0"}
 MAX_HTML = 5_000
 
 logger = logging.getLogger(__name__)
 
+# "<term>|<country>" -> {"count": n, "raw": trimmed json}; the Google
+# fallback is stored under the pseudo-country "google".
+_COUNTS = DiskCache("jobs_counts")
+# "<term>" -> {"YYYY-MM": {cc: count}}; the current month keeps the latest
+# count per country, earlier months are never rewritten.
+_HISTORY = DiskCache("jobs_history")
+TREND_MONTHS = int(os.getenv("JOBS_TREND_MONTHS", "6"))
+# Custom Search queries used today; the quota resets at midnight Pacific.
+_CSE_LEDGER = DiskCache("google_cse_quota")
+_cse_lock = threading.Lock()
+
 # ---------------------------------------------------------------------------
 # Scoring parameters - to tweak if needed
 # ---------------------------------------------------------------------------
@@ -72,6 +100,19 @@ QUALITY_MED_THRESHOLD = 1
 QUALITY_MED_VALUE = 0.4
 QUALITY_LOW_VALUE = 0.2
 
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+
+def _cache_key(term: str, cc: str) -> str:
+    return f"{term.lower()}|{cc}"
+
+
+def _cached(term: str, cc: str) -> Dict[str, Any] | None:
+    return _COUNTS.get(_cache_key(term, cc), ttl=CACHE_TTL_HOURS * 3600)
+
+
 # ---------------------------------------------------------------------------
 # Adzuna helper
 # ---------------------------------------------------------------------------
@@ -103,6 +144,68 @@ def _adzuna_jobs(term: str, cc: str) -> Tuple[int, str]:
         return -1, str(exc)
 
 
+def _adzuna_countries(term: str) -> Dict[str, Tuple[int, str]]:
+    """``{cc: (count, raw)}`` for every ADZ_COUNTRIES entry, from the cache
+    where fresh and otherwise fetched concurrently."""
+    out: Dict[str, Tuple[int, str]] = {}
+    todo = []
+    for cc in ADZ_COUNTRIES:
+        hit = _cached(term, cc)
+        if hit is None:
+            todo.append(cc)
+        else:
+            out[cc] = (hit["count"], hit["raw"])
+    if todo:
+        with ThreadPoolExecutor(max_workers=min(ADZ_CONCURRENCY,
+                                                len(todo))) as ex:
+            fetched = dict(zip(todo, ex.map(
+                lambda cc: _adzuna_jobs(term, cc), todo)))
+        _COUNTS.set_many({
+            _cache_key(term, cc): {"count": cnt, "raw": blob}
+            for cc, (cnt, blob) in fetched.items() if cnt >= 0
+        })
+        out.update(fetched)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Monthly trend
+# ---------------------------------------------------------------------------
+
+
+def _record_month(term: str, by_country: Dict[str, int]) -> Dict[str, Any]:
+    """Store this month's per-country counts; return the term's history."""
+    key = term.lower()
+    history = _HISTORY.get(key) or {}
+    month = datetime.utcnow().strftime("%Y-%m")
+    if history.get(month) != by_country:
+        history[month] = {**history.get(month, {}), **by_country}
+        history = dict(sorted(history.items())[-TREND_MONTHS:])
+        _HISTORY.set(key, history)
+    return history
+
+
+def _monthly_trend(history: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+    """Direction / growth over the months in *history*, summing only the
+    countries reported in every month so a failed country is no dip."""
+    months = sorted(history)
+    common = set(ADZ_COUNTRIES).intersection(*(history[m] for m in months))
+    if len(months) < 2 or not common:
+        return {
+            "trend_direction": "insufficient_data",
+            "growth_rate": 0,
+            "monthly_totals": {},
+        }
+    totals = [sum(history[m][cc] for cc in common) for m in months]
+    tr = series_trend(totals, rule="endpoints")
+    return {
+        "trend_direction": tr["direction"],
+        "growth_rate": tr["growth"],
+        "trend_slope": tr["slope"],  # jobs/month
+        "monthly_totals": dict(zip(months, totals)),
+    }
+
+
 # ---------------------------------------------------------------------------
 # Google CSE fallback
 # ---------------------------------------------------------------------------
@@ -111,9 +214,32 @@ def _adzuna_jobs(term: str, cc: str) -> Tuple[int, str]:
 _G_PATTERN = re.compile(r"([\d,]+)\s+jobs available", re.I)
 
 
+def _pacific_day() -> str:
+    return datetime.now(ZoneInfo("America/Los_Angeles")).date().isoformat()
+
+
+def _take_cse_query() -> bool:
+    """Count one Custom Search query against today's limit, if any is left."""
+    with _cse_lock:
+        entry = _CSE_LEDGER.get("usage") or {}
+        today = _pacific_day()
+        used = entry.get("used", 0) if entry.get("day") == today else 0
+        if used >= GOOGLE_CSE_DAILY_LIMIT:
+            return False
+        _CSE_LEDGER.set("usage", {"day": today, "used": used + 1})
+        return True
+
+
 def _google_jobs(term: str) -> Tuple[int, str]:
     if not (GOOGLE_API_KEY and CSE_ID):
         return 0, "missing creds"
+    hit = _cached(term, "google")
+    if hit is not None:
+        return hit["count"], hit["raw"]
+    if not _take_cse_query():
+        logger.debug("Google CSE daily limit (%d) reached",
+                     GOOGLE_CSE_DAILY_LIMIT)
+        return 0, "daily limit"
 
     url = "https://www.googleapis.com/customsearch/v1"
     params = {
@@ -132,11 +258,15 @@ def _google_jobs(term: str) -> Tuple[int, str]:
         for it in r.json().get("items", []):
             m = _G_PATTERN.search(it.get("snippet", ""))
             if m:
-                return int(m.group(1).replace(",",
-                                              "")), json.dumps(it)[:MAX_HTML]
+                cnt = int(m.group(1).replace(",", ""))
+                blob = json.dumps(it)[:MAX_HTML]
+                break
+        else:
+            cnt, blob = 0, "no‑match"
     except Exception as exc:  # pragma: no cover – network
         return 0, str(exc)
-    return 0, "no‑match"
+    _COUNTS.set(_cache_key(term, "google"), {"count": cnt, "raw": blob})
+    return cnt, blob
 
 
 # ---------------------------------------------------------------------------
@@ -152,13 +282,11 @@ def collect_jobs_signals(tech: Mapping[str,
     successes = 0
 
     if ADZ_APP_ID and ADZ_APP_KEY:
-        for cc in ADZ_COUNTRIES:
-            cnt, blob = _adzuna_jobs(term, cc)
+        for cc, (cnt, blob) in _adzuna_countries(term).items():
             if cnt >= 0:
                 metrics["by_country"][cc] = cnt
                 raw[cc] = blob
                 successes += 1
-            time.sleep(0.2)  # stay friendly
     else:
         logger.debug("No Adzuna creds – fallback to Google CSE")
         cnt, blob = _google_jobs(term)
@@ -170,6 +298,9 @@ def collect_jobs_signals(tech: Mapping[str,
     total = sum(metrics["by_country"].values())
     metrics["total_jobs"] = total
     metrics["raw"] = raw
+    if metrics["source"] == "adzuna" and successes:
+        metrics.update(
+            _monthly_trend(_record_month(term, metrics["by_country"])))
 
     # Deaditude score (lower = healthier job market)
     if total >= JOBS_VERY_HIGH_THRESHOLD:
@@ -200,9 +331,10 @@ def collect_jobs_signals(tech: Mapping[str,
         quality = QUALITY_LOW_VALUE
 
     logger.debug(
-        "Jobs → %s: total=%d deaditude=%.1f quality=%.1f",
+        "Jobs → %s: total=%d trend=%s deaditude=%.1f quality=%.1f",
         term,
         total,
+        metrics.get("trend_direction", "n/a"),
         deaditude,
         quality,
     )
@@ -4,23 +4,35 @@ from __future__ import annotations
 =======================
 Robust, raw-preserving Reddit collector (v2).
 
+Talks to the Reddit OAuth API directly with aiohttp: one app-only token
+and session are shared by all techs, listings for a tech are fetched
+concurrently and requests are paced by Reddit's ``X-Ratelimit-*`` headers.
+
 * ``collect_reddit_signals(tech) -> (metrics, quality)``
 """
 
 # ───────────────────────── Imports ────────────────────────────
 import argparse
+import asyncio
+import atexit
 import json
 import logging
 import os
+import random
 import re
 import statistics
+import threading
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
-import praw
+import aiohttp
 from dotenv import load_dotenv
-from textblob import TextBlob
+
+from engine.analytics.matcher import TermMatcher, tech_aliases
+from engine.analytics.sentiment import score_texts
+from engine.analytics.trends import period_trend
+from packages.cache.store import DiskCache
 
 load_dotenv()
 
@@ -30,8 +42,38 @@ load_dotenv()
 REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
 REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
 
+API_BASE = "https://oauth.reddit.com"
+TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+USER_AGENT = "deaditude-reddit-collector/2.0"
+
+# Requests in flight at once, and how much of the reported per-window
+# budget (X-Ratelimit-Remaining) is left untouched.
+MAX_CONCURRENCY = int(os.getenv("REDDIT_CONCURRENCY", "4"))
+RATELIMIT_RESERVE = int(os.getenv("REDDIT_RATELIMIT_RESERVE", "10"))
+
 SINCE_DAYS = int(os.getenv("REDDIT_WINDOW_DAYS", "30"))
 POST_LIMIT = int(os.getenv("REDDIT_MAX_POSTS", "500"))
+# Posts kept (reservoir-sampled) for the median score and the trend split;
+# counts, sums and sentiment are exact running aggregates.
+STATS_SAMPLE = int(os.getenv("REDDIT_STATS_SAMPLE", "1000"))
+SENTIMENT_CHUNK = 256  # titles scored per score_texts call
+
+# Discovered subreddit names and their slow-moving stats are cached so that
+# techs without a registry ``subreddit`` skip discovery on later runs.
+SUB_TTL_DAYS = float(os.getenv("REDDIT_SUB_TTL_DAYS", "90"))
+STATS_TTL_DAYS = float(os.getenv("REDDIT_STATS_TTL_DAYS", "7"))
+_SUB_CACHE = DiskCache("reddit_subreddits")
+
+# Posts are kept per subreddit between runs; scores are re-read only for
+# posts younger than REFRESH_DAYS, older ones have settled.
+REFRESH_DAYS = float(os.getenv("REDDIT_REFRESH_DAYS", "3"))
+
+# Low-traffic techs are matched locally against one shared listing of the
+# fallback subs per run instead of one search per sub per tech.
+FALLBACK_SCAN_LIMIT = int(os.getenv("REDDIT_FALLBACK_SCAN_LIMIT", "1000"))
+_FALLBACK_POOL: Optional[List[_Post]] = None
+_FALLBACK_MATCHES: Dict[str, List[_Post]] = {}
+_STATS_CACHE = DiskCache("reddit_sub_stats")
 
 DEV_FALLBACK_SUBS = [
     "programming",
@@ -92,128 +134,538 @@ logger = logging.getLogger(__name__)
 
 
 # ---------------------------------------------------------------------------
-# Reddit client
+# Reddit client – app-only OAuth over one shared aiohttp session
 # ---------------------------------------------------------------------------
-def _init_reddit() -> Optional[praw.Reddit]:
+class _RedditAPI:
+    """Minimal async Reddit API client that paces itself by the
+    ``X-Ratelimit-*`` headers Reddit returns on every response."""
+
+    def __init__(self, client_id: str, client_secret: str):
+        self._auth = aiohttp.BasicAuth(client_id, client_secret)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._token: Optional[str] = None
+        self._token_exp = 0.0
+        self._remaining: Optional[float] = None
+        self._reset_at = 0.0
+        self._sem = asyncio.Semaphore(MAX_CONCURRENCY)
+        self._token_lock = asyncio.Lock()
+        self._budget_lock = asyncio.Lock()
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    # ───────────────────────── internals ──────────────────────────
+    def _http(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={"User-Agent": USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=30),
+            )
+        return self._session
+
+    async def _bearer(self) -> str:
+        async with self._token_lock:
+            if self._token and time.time() < self._token_exp - 60:
+                return self._token
+            async with self._http().post(
+                TOKEN_URL,
+                auth=self._auth,
+                data={"grant_type": "client_credentials"},
+            ) as resp:
+                resp.raise_for_status()
+                body = await resp.json()
+            self._token = body["access_token"]
+            self._token_exp = time.time() + float(body.get("expires_in", 3600))
+            return self._token
+
+    async def _reserve(self) -> None:
+        """Wait until the reported budget allows one more request."""
+        while True:
+            async with self._budget_lock:
+                now = time.time()
+                if self._reset_at and now >= self._reset_at:
+                    self._remaining, self._reset_at = None, 0.0
+                if self._remaining is None:
+                    return
+                if self._remaining > RATELIMIT_RESERVE:
+                    self._remaining -= 1  # in flight, header not seen yet
+                    return
+                wait = self._reset_at - now
+            logger.debug("Reddit budget low, waiting %.0fs", wait)
+            await asyncio.sleep(max(1.0, wait))
+
+    def _track(self, headers) -> None:
+        remaining = headers.get("X-Ratelimit-Remaining")
+        reset = headers.get("X-Ratelimit-Reset")
+        if remaining is None or reset is None:
+            return
+        self._remaining = float(remaining)
+        self._reset_at = time.time() + float(reset)
+
+    # ───────────────────────── requests ───────────────────────────
+    async def get(self, path: str, **params) -> Dict[str, Any]:
+        params = {k: v for k, v in params.items() if v is not None}
+        params["raw_json"] = 1
+        async with self._sem:
+            for attempt in range(3):
+                await self._reserve()
+                headers = {"Authorization": f"bearer {await self._bearer()}"}
+                async with self._http().get(
+                    API_BASE + path, params=params, headers=headers
+                ) as resp:
+                    self._track(resp.headers)
+                    if resp.status == 401 and attempt == 0:
+                        self._token = None  # expired early, re-authenticate
+                        continue
+                    if resp.status == 429:
+                        wait = float(resp.headers.get("X-Ratelimit-Reset", 60))
+                        logger.debug("Reddit 429, retry in %.0fs", wait)
+                        await asyncio.sleep(wait)
+                        continue
+                    resp.raise_for_status()
+                    return await resp.json()
+        raise RuntimeError(f"Reddit API failed repeatedly for {path}")
+
+    async def listing(
+        self,
+        path: str,
+        limit: int,
+        stop: Optional[Callable[[dict], bool]] = None,
+        **params,
+    ) -> List[dict]:
+        """Up to *limit* items of a listing, paging by ``after``; stops early
+        at the first item for which *stop* returns true."""
+        out: List[dict] = []
+        after = None
+        while len(out) < limit:
+            page = (await self.get(
+                path, limit=min(100, limit - len(out)), after=after, **params
+            ))["data"]
+            for child in page["children"]:
+                if stop and stop(child["data"]):
+                    return out
+                out.append(child["data"])
+            after = page.get("after")
+            if not after or not page["children"]:
+                break
+        return out
+
+    async def info(self, fullnames: List[str]) -> List[dict]:
+        """Current data for known fullnames, 100 per request, concurrently."""
+        pages = await asyncio.gather(*(
+            self.get("/api/info", id=",".join(fullnames[i: i + 100]))
+            for i in range(0, len(fullnames), 100)
+        ))
+        return [c["data"] for page in pages for c in page["data"]["children"]]
+
+
+def _init_reddit() -> Optional[_RedditAPI]:
     if not (REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET):
         logger.debug("Missing Reddit API credentials")
         return None
-    try:
-        reddit = praw.Reddit(
-            client_id=REDDIT_CLIENT_ID,
-            client_secret=REDDIT_CLIENT_SECRET,
-            user_agent="deaditude-reddit-collector/2.0",
-        )
-        logger.debug("Reddit client initialised")
-        return reddit
-    except Exception as exc:
-        logger.debug("Error initialising Reddit client: %s", exc)
-        return None
+    return _RedditAPI(REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET)
 
 
 reddit = _init_reddit()
 
+# All Reddit I/O runs on one background event loop, so the session, token
+# and rate-limit budget are shared by every tech of the batch while the
+# public entry points stay synchronous.
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
 
-# ---------------------------------------------------------------------------
-# Helper functions (logic unchanged)
-# ---------------------------------------------------------------------------
-def _sentiment(txt: str) -> float:
-    try:
-        return TextBlob(txt).sentiment.polarity
-    except Exception:
-        return 0.0
 
+def _run(coro):
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(
+                target=_LOOP.run_forever, name="reddit-io", daemon=True
+            ).start()
+            if reddit:
+                atexit.register(_shutdown)
+    return asyncio.run_coroutine_threadsafe(coro, _LOOP).result()
 
-def _find_best_sub(term: str) -> Optional[str]:
-    if not reddit:
-        return None
+
+def _shutdown() -> None:
     try:
-        matches = list(reddit.subreddits.search(term, limit=5))
-        matches.sort(key=lambda s: getattr(s, "subscribers", 0), reverse=True)
-        for sub in matches:
-            if term.lower() in sub.display_name.lower():
-                return sub.display_name
-        return matches[0].display_name if matches else None
+        _run(reddit.close())
     except Exception as exc:
-        logger.debug("Find‑sub error: %s", exc)
-        return None
+        logger.debug("Reddit session close failed: %s", exc)
 
 
-def _get_subreddit_stats(name: str) -> Dict[str, Any]:
+# ---------------------------------------------------------------------------
+# Helper functions (logic unchanged)
+# ---------------------------------------------------------------------------
+async def _find_best_sub(term: str) -> Optional[str]:
+    matches = await reddit.listing("/subreddits/search", 5, q=term)
+    matches.sort(key=lambda s: s.get("subscribers") or 0, reverse=True)
+    for sub in matches:
+        if term.lower() in sub["display_name"].lower():
+            return sub["display_name"]
+    return matches[0]["display_name"] if matches else None
+
+
+async def _resolve_sub(term: str) -> Optional[str]:
+    """Discovered subreddit for *term*, cached (negatives included)."""
+    key = term.lower()
+    cached = _SUB_CACHE.get(key, ttl=SUB_TTL_DAYS * 86_400)
+    if cached is not None:
+        return cached.get("name")
     if not reddit:
-        return {}
+        return None
     try:
-        sub = reddit.subreddit(name)
-        return {
-            "display_name": sub.display_name,
-            "subscribers": sub.subscribers,
-            "active_users": getattr(sub, "active_user_count", 0),
-            "created_utc": sub.created_utc,
-            "description": (
-                sub.description[:500] if
-                hasattr(sub, "description") else ""
-            ),
-            "over18": sub.over18,
-            "url": f"https://www.reddit.com{sub.url}",
-            "age_days": (
-                (datetime.utcnow().timestamp() - sub.created_utc) / 86400
-            ),
-        }
+        name = await _find_best_sub(term)
     except Exception as exc:
-        logger.debug("Subreddit stats error: %s", exc)
-        return {}
+        logger.debug("Find‑sub error: %s", exc)
+        return None
+    _SUB_CACHE.set(key, {"name": name})
+    return name
 
 
-def _calc_engagement(posts: List[dict]) -> Dict[str, Any]:
-    if not posts:
-        return {"avg_score": 0, "median_score": 0, "max_score": 0}
-    scores = [p["score"] for p in posts]
+async def _get_subreddit_stats(name: str) -> Dict[str, Any]:
+    key = name.lower()
+    stats = _STATS_CACHE.get(key, ttl=STATS_TTL_DAYS * 86_400)
+    if stats is None:
+        if not reddit:
+            return {}
+        try:
+            sub = (await reddit.get(f"/r/{name}/about"))["data"]
+            stats = {
+                "display_name": sub["display_name"],
+                "subscribers": sub.get("subscribers") or 0,
+                "active_users": sub.get("active_user_count") or 0,
+                "created_utc": sub["created_utc"],
+                "description": (sub.get("description") or "")[:500],
+                "over18": sub.get("over18", False),
+                "url": f"https://www.reddit.com{sub['url']}",
+            }
+        except Exception as exc:
+            logger.debug("Subreddit stats error: %s", exc)
+            return {}
+        _STATS_CACHE.set(key, stats)
     return {
-        "avg_score": sum(scores) / len(scores),
-        "median_score": statistics.median(scores),
-        "max_score": max(scores),
-        "posts_with_high_engagement": (
-            sum(s >= HIGH_ENGAGEMENT for s in scores)
-            ),
-        "posts_with_med_engagement": sum(
-            MED_ENGAGEMENT <= s < HIGH_ENGAGEMENT for s in scores
-        ),
-        "posts_with_low_engagement": sum(
-            LOW_ENGAGEMENT <= s < MED_ENGAGEMENT for s in scores
+        **stats,
+        "age_days": (
+            (datetime.utcnow().timestamp() - stats["created_utc"]) / 86400
         ),
     }
 
 
-def _trend_metrics(posts: List[dict]) -> Dict[str, Any]:
-    if len(posts) < 3:
-        return {"trend_direction": "insufficient_data"}
-    posts_sorted = sorted(posts, key=lambda p: p["created"])
-    oldest, newest = posts_sorted[0]["created"], posts_sorted[-1]["created"]
-    span = newest - oldest
-    if span < 86_400:
-        return {"trend_direction": "insufficient_data"}
-    seg = span / 3
-    buckets = [
-        [p for p in posts if
-         oldest + i * seg <= p["created"] < oldest + (i + 1) * seg]
-        for i in range(3)
-    ]
-    counts = [len(b) for b in buckets]
-    avg_scores = [sum(p["score"] for p in b) / len(b) if
-                  b else 0 for b in buckets]
-    if counts[0] < counts[1] < counts[2]:
-        direction = "increasing"
-    elif counts[0] > counts[1] > counts[2]:
-        direction = "decreasing"
-    else:
-        direction = "stable"
-    growth = (counts[2] / counts[0] - 1) if counts[0] else 0
-    return {
-        "trend_direction": direction,
-        "growth_rate": growth,
-        "segment_counts": counts,
-        "segment_avg_scores": avg_scores,
+class _Post:
+    """Compact post record; persisted in the post store via ``as_dict``."""
+
+    __slots__ = ("id", "title", "score", "created", "url", "sub",
+                 "num_comments", "upvote_ratio")
+
+    def __init__(
+        self,
+        id: str,
+        title: str,
+        score: int,
+        created: float,
+        url: str,
+        sub: str,
+        num_comments: int,
+        upvote_ratio: Optional[float] = None,
+    ):
+        self.id = id
+        self.title = title
+        self.score = score
+        self.created = created
+        self.url = url
+        self.sub = sub
+        self.num_comments = num_comments
+        self.upvote_ratio = upvote_ratio
+
+    @classmethod
+    def from_json(cls, d: Dict[str, Any]) -> _Post:
+        """Record from the ``data`` of a ``t3`` listing child."""
+        return cls(
+            d["name"],
+            d["title"],
+            d["score"],
+            d["created_utc"],
+            d["url"],
+            d["subreddit"],
+            d["num_comments"],
+            d.get("upvote_ratio"),
+        )
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> _Post:
+        return cls(**{k: d.get(k) for k in cls.__slots__})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+def _trim_store(posts: Dict[str, _Post], keep_max: int) -> Dict[str, _Post]:
+    """Keep the newest and the best-scored halves, like the top/new seed."""
+    if len(posts) <= keep_max:
+        return posts
+    newest = sorted(posts, key=lambda k: posts[k].created,
+                    reverse=True)[:keep_max // 2]
+    keep = set(newest)
+    for k in sorted(posts, key=lambda k: posts[k].score, reverse=True):
+        if len(keep) >= keep_max:
+            break
+        keep.add(k)
+    return {k: posts[k] for k in keep}
+
+
+async def _collect_sub_posts(
+    sub_name: str,
+    since_epoch: int,
+    listing_limit: int = POST_LIMIT // 2,
+    keep_max: int = POST_LIMIT,
+    seed_top: bool = True,
+) -> List[_Post]:
+    """Posts of *sub_name* inside the window, via the rolling post store.
+
+    Only posts newer than the store's high-water mark are listed; scores of
+    known posts young enough to still move are refreshed in bulk through
+    ``/api/info`` (100 fullnames per request) and posts that left the
+    window are evicted.  The listings and the refresh run concurrently.
+    """
+    if not reddit:
+        return []
+    store = DiskCache(f"reddit_posts/{sub_name.lower()}")
+    state = store.get("state") or {"hwm": 0, "posts": {}}
+    hwm = state["hwm"]
+    posts = {
+        k: _Post.from_dict(v)
+        for k, v in state["posts"].items()
+        if v["created"] >= since_epoch
+    }
+    # Known posts are all at or below the mark, so the new listing never
+    # returns them and they can be refreshed alongside it.
+    refresh_after = time.time() - REFRESH_DAYS * 86_400
+    stale = [k for k, v in posts.items() if v.created >= refresh_after]
+    try:
+        calls = [
+            reddit.listing(
+                f"/r/{sub_name}/new",  # newest first
+                listing_limit,
+                stop=lambda d: (d["created_utc"] <= hwm
+                                or d["created_utc"] < since_epoch),
+            ),
+            reddit.info(stale),
+        ]
+        if seed_top and not hwm:  # cold start: seed with the month's top
+            calls.append(reddit.listing(
+                f"/r/{sub_name}/top", POST_LIMIT // 2, t="month"
+            ))
+        new, refreshed, *top = await asyncio.gather(*calls)
+
+        for d in top[0] if top else []:
+            if d["created_utc"] >= since_epoch:
+                posts[d["name"]] = _Post.from_json(d)
+        newest = hwm
+        for d in new:
+            posts[d["name"]] = _Post.from_json(d)
+            newest = max(newest, d["created_utc"])
+        for d in refreshed:
+            rec = posts.get(d["name"])
+            if rec is not None:
+                rec.score = d["score"]
+                rec.num_comments = d["num_comments"]
+                rec.upvote_ratio = d.get("upvote_ratio")
+        # Only advance the mark once the listing was walked without error.
+        hwm = newest
+    except Exception as exc:
+        logger.debug("Reddit fetch error: %s", exc)
+
+    posts = _trim_store(posts, keep_max)
+    store.set("state", {
+        "hwm": hwm,
+        "posts": {k: v.as_dict() for k, v in posts.items()},
+    })
+    return list(posts.values())
+
+
+async def _fallback_pool(since_epoch: int) -> List[_Post]:
+    """Recent posts of every DEV_FALLBACK_SUBS, listed once per run."""
+    global _FALLBACK_POOL
+    if _FALLBACK_POOL is None:
+        listings = await asyncio.gather(*(
+            _collect_sub_posts(
+                sub_name,
+                since_epoch,
+                listing_limit=FALLBACK_SCAN_LIMIT,
+                keep_max=FALLBACK_SCAN_LIMIT,
+                seed_top=False,
+            )
+            for sub_name in DEV_FALLBACK_SUBS
+        ))
+        _FALLBACK_POOL = [p for posts in listings for p in posts]
+    return _FALLBACK_POOL
+
+
+async def _prepare_batch(techs: List[Dict[str, Any]]) -> None:
+    if not reddit:
+        return
+    since_epoch = int((datetime.utcnow() -
+                       timedelta(days=SINCE_DAYS)).timestamp())
+    candidates = {
+        (t if isinstance(t, str) else t["name"]).lower(): tech_aliases(t)
+        for t in techs
+        if isinstance(t, str) or not t.get("subreddit")
     }
+    if not candidates:
+        return
+    matcher = TermMatcher(candidates)
+    for key in candidates:
+        _FALLBACK_MATCHES[key] = []
+    for post in await _fallback_pool(since_epoch):
+        if post.created < since_epoch:
+            continue
+        for key in matcher.find(post.title):
+            _FALLBACK_MATCHES[key].append(post)
+
+
+def prepare_batch(techs: List[Dict[str, Any]]) -> None:
+    """Match all *techs* that may need the fallback against the shared
+    fallback-subreddit posts in a single pass."""
+    _run(_prepare_batch(techs))
+
+
+async def _fallback_posts(tech) -> List[_Post]:
+    key = (tech if isinstance(tech, str) else tech["name"]).lower()
+    if key not in _FALLBACK_MATCHES:
+        await _prepare_batch([tech])
+    return _FALLBACK_MATCHES.get(key, [])
+
+
+async def _fetch(
+    tech, tech_name: str, specified_sub: Optional[str], since_epoch: int
+) -> Tuple[Optional[str], Dict[str, Any], List[_Post], List[_Post]]:
+    """Subreddit, its stats, its posts and fallback matches for one tech;
+    stats and posts are requested concurrently."""
+    official_sub = (
+        specified_sub or
+        MANUAL_MAP.get(tech_name.lower()) or
+        await _resolve_sub(tech_name)
+    )
+    sub_stats: Dict[str, Any] = {}
+    official: List[_Post] = []
+    if official_sub:
+        sub_stats, official = await asyncio.gather(
+            _get_subreddit_stats(official_sub),
+            _collect_sub_posts(official_sub, since_epoch),
+        )
+    fallback: List[_Post] = []
+    if reddit and len(official) < 10 and not specified_sub:
+        fallback = await _fallback_posts(tech)
+    return official_sub, sub_stats, official, fallback
+
+
+def _iter_posts(
+    official: List[_Post], fallback: List[_Post]
+) -> Iterator[_Post]:
+    """Stream the tech's posts once, de-duplicated by id.
+
+    The official subreddit comes first; the shared fallback matches only
+    top the stream up to POST_LIMIT.
+    """
+    seen: set[str] = set()
+    for post in official:
+        if post.id not in seen:
+            seen.add(post.id)
+            yield post
+    for post in fallback:
+        if len(seen) >= POST_LIMIT:
+            break
+        if post.id not in seen:
+            seen.add(post.id)
+            yield post
+
+
+class _PostStats:
+    """Engagement, migration, sentiment and trend aggregates fed one post at
+    a time; only a bounded reservoir of ``(created, score)`` pairs and the
+    ``raw`` sample are kept."""
+
+    __slots__ = ("count", "score_sum", "max_score", "high", "med", "low",
+                 "migration_hits", "sentiment_sum", "_titles", "reservoir",
+                 "sample", "_rng")
+
+    def __init__(self):
+        self.count = 0
+        self.score_sum = 0
+        self.max_score = 0
+        self.high = self.med = self.low = 0
+        self.migration_hits = 0
+        self.sentiment_sum = 0.0
+        self._titles: List[str] = []  # not yet scored, < SENTIMENT_CHUNK
+        self.reservoir: List[Tuple[float, int]] = []
+        self.sample: List[Dict[str, Any]] = []  # first 100, for ``raw``
+        self._rng = random.Random(0)
+
+    def add(self, post: _Post) -> None:
+        score = post.score
+        if not self.count or score > self.max_score:
+            self.max_score = score
+        self.count += 1
+        self.score_sum += score
+        if score >= HIGH_ENGAGEMENT:
+            self.high += 1
+        elif score >= MED_ENGAGEMENT:
+            self.med += 1
+        elif score >= LOW_ENGAGEMENT:
+            self.low += 1
+        if MIGRATION_RE.search(post.title):
+            self.migration_hits += 1
+        self._titles.append(post.title)
+        if len(self._titles) >= SENTIMENT_CHUNK:
+            self._score_titles()
+        if len(self.reservoir) < STATS_SAMPLE:
+            self.reservoir.append((post.created, score))
+        else:
+            j = self._rng.randrange(self.count)
+            if j < STATS_SAMPLE:
+                self.reservoir[j] = (post.created, score)
+        if len(self.sample) < 100:
+            self.sample.append(post.as_dict())
+
+    def _score_titles(self) -> None:
+        if self._titles:
+            self.sentiment_sum += sum(score_texts(self._titles))
+            self._titles = []
+
+    def avg_sentiment(self) -> float:
+        self._score_titles()
+        return self.sentiment_sum / self.count if self.count else 0
+
+    def engagement(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"avg_score": 0, "median_score": 0, "max_score": 0}
+        return {
+            "avg_score": self.score_sum / self.count,
+            "median_score": statistics.median(s for _, s in self.reservoir),
+            "max_score": self.max_score,
+            "posts_with_high_engagement": self.high,
+            "posts_with_med_engagement": self.med,
+            "posts_with_low_engagement": self.low,
+        }
+
+    def trend(self) -> Dict[str, Any]:
+        if self.count < 3:
+            return {"trend_direction": "insufficient_data"}
+        created, scores = zip(*self.reservoir)
+        tr = period_trend(created, scores, periods=3, rule="strict")
+        if tr is None:
+            return {"trend_direction": "insufficient_data"}
+        scale = self.count / len(self.reservoir)  # 1 unless sampled
+        return {
+            "trend_direction": tr["direction"],
+            "growth_rate": tr["growth"],
+            "trend_slope": tr["slope"] * scale,
+            "segment_counts": [round(c * scale) for c in tr["counts"]],
+            "segment_avg_scores": tr["weight_means"],
+        }
 
 
 def _activity_score(
@@ -294,83 +746,16 @@ def collect_reddit_signals(tech) -> Tuple[Dict[str, Any], float]:
         tech_name = tech["name"]
         specified_sub = tech.get("subreddit")
 
-    official_sub = (
-        specified_sub or
-        MANUAL_MAP.get(tech_name.lower()) or
-        _find_best_sub(tech_name)
-    )
-    sub_stats = _get_subreddit_stats(official_sub) if official_sub else {}
-
     since_epoch = int((datetime.utcnow() -
                        timedelta(days=SINCE_DAYS)).timestamp())
-    posts: List[dict] = []
+    official_sub, sub_stats, official, fallback = _run(
+        _fetch(tech, tech_name, specified_sub, since_epoch)
+    )
+    stats = _PostStats()
+    for post in _iter_posts(official, fallback):
+        stats.add(post)
 
-    if official_sub and reddit:
-        try:
-            sub = reddit.subreddit(official_sub)
-            for p in sub.top(time_filter="month", limit=POST_LIMIT // 2):
-                if p.created_utc < since_epoch:
-                    continue
-                posts.append(
-                    {
-                        "title": p.title,
-                        "score": p.score,
-                        "created": p.created_utc,
-                        "url": p.url,
-                        "sub": p.subreddit.display_name,
-                        "num_comments": p.num_comments,
-                        "upvote_ratio": getattr(p, "upvote_ratio", None),
-                    }
-                )
-            for p in sub.new(limit=POST_LIMIT // 2):
-                if (
-                    p.created_utc < since_epoch or
-                    any(e["url"] == p.url for e in posts)
-                ):
-                    continue
-                posts.append(
-                    {
-                        "title": p.title,
-                        "score": p.score,
-                        "created": p.created_utc,
-                        "url": p.url,
-                        "sub": p.subreddit.display_name,
-                        "num_comments": p.num_comments,
-                        "upvote_ratio": getattr(p, "upvote_ratio", None),
-                    }
-                )
-        except Exception as exc:
-            logger.debug("PRAW fetch error: %s", exc)
-
-    if reddit and len(posts) < 10 and not specified_sub:
-        for sub_name in DEV_FALLBACK_SUBS:
-            try:
-                sub = reddit.subreddit(sub_name)
-                for p in sub.search(
-                    tech_name,
-                    limit=POST_LIMIT // len(DEV_FALLBACK_SUBS),
-                    params={"syntax": "plain"},
-                ):
-                    if p.created_utc < since_epoch:
-                        continue
-                    posts.append(
-                        {
-                            "title": p.title,
-                            "score": p.score,
-                            "created": p.created_utc,
-                            "url": p.url,
-                            "sub": p.subreddit.display_name,
-                            "num_comments": p.num_comments,
-                            "upvote_ratio": getattr(p, "upvote_ratio", None),
-                        }
-                    )
-                if len(posts) >= POST_LIMIT:
-                    break
-            except Exception as exc:
-                logger.debug("Fallback sub error: %s", exc)
-            time.sleep(0.25)
-
-    if not posts:
+    if not stats.count:
         return {
             "post_count": 0,
             "avg_sentiment": 0,
@@ -382,14 +767,13 @@ def collect_reddit_signals(tech) -> Tuple[Dict[str, Any], float]:
             "raw": {"posts": []},
         }, 0.3
 
-    sentiments = [_sentiment(p["title"]) for p in posts]
-    avg_sent = sum(sentiments) / len(sentiments) if sentiments else 0
-    migration_hits = sum(bool(MIGRATION_RE.search(p["title"])) for p in posts)
+    avg_sent = stats.avg_sentiment()
+    migration_hits = stats.migration_hits
 
-    engagement = _calc_engagement(posts)
-    trend = _trend_metrics(posts)
+    engagement = stats.engagement()
+    trend = stats.trend()
 
-    activity = _activity_score(sub_stats, len(posts), engagement, trend)
+    activity = _activity_score(sub_stats, stats.count, engagement, trend)
 
     sentiment_score = max(0, min(10, (avg_sent + 1) * 5))
     migration_penalty = min(5, migration_hits)
@@ -412,20 +796,20 @@ def collect_reddit_signals(tech) -> Tuple[Dict[str, Any], float]:
             deaditude = min(3.0, deaditude)
 
     quality = (
-        1.0 if len(posts) >= 15 and
+        1.0 if stats.count >= 15 and
         official_sub else
-        0.7 if len(posts) >= 5 else 0.4
+        0.7 if stats.count >= 5 else 0.4
     )
 
     metrics = {
-        "post_count": len(posts),
+        "post_count": stats.count,
         "avg_sentiment": round(avg_sent, 3),
         "migration_mentions": migration_hits,
         "subreddit_metrics": sub_stats,
         "engagement_metrics": engagement,
         "trend_metrics": trend,
         "deaditude_score": deaditude,
-        "raw": {"posts": posts[:100]},
+        "raw": {"posts": stats.sample},
     }
     return metrics, quality
 
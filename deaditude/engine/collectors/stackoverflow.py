@@ -18,31 +18,95 @@ Passing --verbose enables DEBUG-level logging; otherwise the script is silent.
 import argparse
 import json
 import logging
+import math
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from statistics import median
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
 
 import requests
 from dateutil import parser as dtparse
 from dotenv import load_dotenv
 
+from engine.analytics.trends import series_trend
+from packages.auth.credentials import CredentialPool, env_credentials
+from packages.cache.store import DiskCache
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 load_dotenv()
 
-BASE_URL = "https://api.stackexchange.com/2.3/questions"
+API_ROOT = "https://api.stackexchange.com/2.3"
+BASE_URL = f"{API_ROOT}/questions"
 SITE = "stackoverflow"
 SINCE_DAYS = int(os.getenv("SO_WINDOW_DAYS", "30"))
-MAX_Q = int(os.getenv("SO_MAX_Q", "400"))
-APP_KEY = os.getenv("STACK_APP_KEY")  # optional
-FILTER = "!9Z(-wsMqT"  # minimal filter
+# Volume and trend come from count-only calls (``filter=total``); full
+# question objects are only downloaded for a sample used in the answer,
+# view and response-time stats.
+SAMPLE_Q = int(os.getenv("SO_SAMPLE_Q", "100"))
+TREND_WEEKS = int(os.getenv("SO_TREND_WEEKS", "26"))
+WEEK_SECONDS = 7 * 86_400
+# STACK_APP_KEYS (comma-separated) and/or the legacy STACK_APP_KEY, optional
+APP_KEYS: List[str] = env_credentials("STACK_APP_KEYS", "STACK_APP_KEY")
+FALLBACK_FILTER = "!9Z(-wsMqT"  # generic, used if filter creation fails
+# Exactly what collect_so_signals reads; turned into a filter id once with
+# /filters/create and cached.  ``.total`` lets the first page report the
+# window's question count.
+FILTER_FIELDS = (
+    ".backoff",
+    ".has_more",
+    ".items",
+    ".quota_max",
+    ".quota_remaining",
+    ".total",
+    "question.question_id",
+    "question.creation_date",
+    "question.last_activity_date",
+    "question.is_answered",
+    "question.accepted_answer_id",
+    "question.answer_count",
+    "question.closed_reason",
+    "question.view_count",
+    "question.answers",
+    "answer.creation_date",
+)
+# Sample pages after the first are fetched concurrently; the API caps a page
+# at 100 questions, so this only applies when SO_SAMPLE_Q is above 100
+MAX_WORKERS = int(os.getenv("SO_MAX_WORKERS", "4"))
 
 logger = logging.getLogger(__name__)
 
+# Each key carries its own daily quota, reported back as ``quota_remaining``.
+_POOL = CredentialPool("stackexchange", APP_KEYS, limit=10_000)
+
+# Counts of completed weeks hardly move, so each is only requested once.
+_WEEK_COUNTS = DiskCache("so_weekly_counts")
+_FILTERS = DiskCache("so_filters")
+_question_filter_id: Optional[str] = None
+
+# A ``backoff`` from the API holds back every thread, not just the caller.
+_backoff_lock = threading.Lock()
+_backoff_until = 0.0
+
+# Tag name/count lookups, filled for the whole batch by ``prepare_batch``
+# (100 tags per /tags/{tags}/info call); synonyms are only pulled when a tag
+# is missing – the SO_SYNONYM_PAGES most applied pages, kept for a month.
+TAG_TTL_DAYS = float(os.getenv("SO_TAG_TTL_DAYS", "7"))
+SYNONYMS_TTL_DAYS = 30
+SYNONYM_PAGES = int(os.getenv("SO_SYNONYM_PAGES", "3"))
+_TAG_CACHE = DiskCache("so_tags")
+_SYNONYM_CACHE = DiskCache("so_tag_synonyms")
+
+
+def _next_utc_midnight() -> float:
+    return (time.time() // 86_400 + 1) * 86_400
+
 
 class APIBanError(Exception):
     """Raised when Stack Exchange API throttles us for a prolonged period."""
@@ -84,32 +148,38 @@ TREND_PERIODS = 3
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
-def _fetch_page(tag: str,
-                page: int,
-                fromdate: int,
-                todate: int) -> Dict[str, Any]:
-    params = {
-        "site": SITE,
-        "tagged": tag,
-        "fromdate": fromdate,
-        "todate": todate,
-        "pagesize": 100,
-        "page": page,
-        "order": "desc",
-        "sort": "creation",
-        "filter": FILTER,
-    }
-    if APP_KEY:
-        params["key"] = APP_KEY
+def _wait_for_backoff() -> None:
+    wait = _backoff_until - time.time()
+    if wait > 0:
+        time.sleep(wait)
+
+
+def _set_backoff(seconds: float) -> None:
+    global _backoff_until
+    with _backoff_lock:
+        _backoff_until = max(_backoff_until, time.time() + seconds)
+
 
+def _api_get(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    params = {"site": SITE, **params}
     delay = 1.0
     for attempt in range(4):
-        resp = requests.get(BASE_URL, params=params, timeout=12)
+        _wait_for_backoff()
+        key = _POOL.acquire()
+        if key:
+            params["key"] = key
+        resp = requests.get(url, params=params, timeout=12)
         if resp.status_code == 200:
             js = resp.json()
+            if "quota_remaining" in js:
+                _POOL.update(key, js["quota_remaining"],
+                             reset_at=_next_utc_midnight(),
+                             limit=js.get("quota_max"))
+            else:  # filter=total responses carry no wrapper fields
+                _POOL.spend(key)
             if "backoff" in js:
                 logger.debug("Backoff %ss from API", js["backoff"])
-                time.sleep(js["backoff"])
+                _set_backoff(js["backoff"])
             return js
 
         if resp.status_code in (400, 429):
@@ -139,59 +209,259 @@ def _fetch_page(tag: str,
     raise RuntimeError("SO API failed repeatedly")
 
 
-def _analyze_question_trends(questions: List[dict]) -> Dict[str, Any]:
-    if not questions:
-        return {
-            "trend_direction": "insufficient_data",
-            "growth_rate": 0,
-            "period_counts": [],
-            "period_response_times": [],
-        }
+def _question_filter() -> str:
+    global _question_filter_id
+    if _question_filter_id is None:
+        spec = ";".join(FILTER_FIELDS)
+        _question_filter_id = _FILTERS.get(spec)
+        if not _question_filter_id:
+            try:
+                js = _api_get(f"{API_ROOT}/filters/create", {
+                    "include": spec,
+                    "base": "none",
+                    "unsafe": "false",
+                })
+                _question_filter_id = js["items"][0]["filter"]
+                _FILTERS.set(spec, _question_filter_id)
+            except APIBanError:
+                raise
+            except Exception as exc:
+                logger.debug("SO filter creation failed: %s", exc)
+                return FALLBACK_FILTER
+    return _question_filter_id
+
 
-    qs = sorted(questions, key=lambda q: q.get("creation_date", 0))
-    oldest, newest = qs[0]["creation_date"], qs[-1]["creation_date"]
-    span = newest - oldest
-    if span < 86_400:
+def _fetch_page(tag: str,
+                page: int,
+                fromdate: int,
+                todate: int,
+                pagesize: int = 100,
+                sort: str = "creation",
+                min_value: Optional[int] = None) -> Dict[str, Any]:
+    params = {
+        "tagged": tag,
+        "fromdate": fromdate,
+        "todate": todate,
+        "pagesize": pagesize,
+        "page": page,
+        "order": "desc",
+        "sort": sort,
+        "filter": _question_filter(),
+    }
+    if min_value is not None:
+        params["min"] = min_value
+    return _api_get(BASE_URL, params)
+
+
+def _count(tag: str, fromdate: int, todate: int) -> int:
+    """Questions tagged *tag* created in ``[fromdate, todate)``."""
+    js = _api_get(BASE_URL, {
+        "tagged": tag,
+        "fromdate": fromdate,
+        "todate": todate - 1,  # the API bound is inclusive
+        "filter": "total",
+    })
+    return int(js.get("total", 0))
+
+
+def _weekly_counts(tag: str, now: int) -> List[int]:
+    """Questions per completed week for the last TREND_WEEKS weeks, oldest
+    first; only weeks missing from the cache are requested."""
+    end = now // WEEK_SECONDS * WEEK_SECONDS
+    starts = [end - i * WEEK_SECONDS for i in range(TREND_WEEKS, 0, -1)]
+    cached = _WEEK_COUNTS.get(tag) or {}
+    try:
+        for start in starts:
+            if str(start) not in cached:
+                cached[str(start)] = _count(tag, start, start + WEEK_SECONDS)
+    finally:
+        _WEEK_COUNTS.set(tag, {
+            str(s): cached[str(s)] for s in starts if str(s) in cached
+        })
+    return [cached[str(s)] for s in starts]
+
+
+def tag_for(tech: Dict[str, Any]) -> str:
+    """Stack Overflow tag tried for a registry tech."""
+    return tech["name"].replace(" ", "-").lower()
+
+
+def _tags_info(tags: List[str]) -> Dict[str, int]:
+    """``{tag: question count}`` for the tags that exist, 100 per call."""
+    out: Dict[str, int] = {}
+    for i in range(0, len(tags), 100):
+        chunk = tags[i: i + 100]
+        js = _api_get(
+            f"{API_ROOT}/tags/{';'.join(quote(t, safe='') for t in chunk)}"
+            "/info",
+            {"pagesize": 100},
+        )
+        for item in js.get("items", []):
+            out[item["name"]] = item.get("count", 0)
+    return out
+
+
+def _synonym_map() -> Dict[str, str]:
+    """``{synonym: master tag}`` for the most applied synonyms of the site
+    (at most SYNONYM_PAGES calls), cached."""
+    cached = _SYNONYM_CACHE.get("map", ttl=SYNONYMS_TTL_DAYS * 86_400)
+    if cached is not None:
+        return cached
+    mapping: Dict[str, str] = {}
+    for page in range(1, SYNONYM_PAGES + 1):
+        js = _api_get(f"{API_ROOT}/tags/synonyms", {
+            "pagesize": 100,
+            "page": page,
+            "order": "desc",
+            "sort": "applied",
+        })
+        for item in js.get("items", []):
+            mapping[item["from_tag"]] = item["to_tag"]
+        if not js.get("has_more"):
+            break
+    _SYNONYM_CACHE.set("map", mapping)
+    return mapping
+
+
+def _resolve_tags(tags: Iterable[str]) -> None:
+    """Cache the master name and question count of every tag in *tags*;
+    missing tags are looked up among the synonyms, unknown ones cached as
+    ``{"name": None}``."""
+    ttl = TAG_TTL_DAYS * 86_400
+    todo = sorted({t for t in tags if _TAG_CACHE.get(t, ttl=ttl) is None})
+    if not todo:
+        return
+    counts = _tags_info(todo)
+    missing = [t for t in todo if t not in counts]
+    renamed: Dict[str, str] = {}
+    if missing:
+        synonyms = _synonym_map()
+        renamed = {t: synonyms[t] for t in missing if t in synonyms}
+        counts.update(_tags_info(sorted(set(renamed.values()) - set(counts))))
+    for tag in todo:
+        name = renamed.get(tag, tag)
+        if name in counts:
+            _TAG_CACHE.set(tag, {"name": name, "count": counts[name]})
+        else:
+            _TAG_CACHE.set(tag, {"name": None, "count": 0})
+        if name != tag:
+            logger.debug("SO tag %s resolved to %s", tag, name)
+
+
+def prepare_batch(techs: List[Dict[str, Any]]) -> None:
+    """Resolve the tags of all *techs* before any per-tech crawl."""
+    _resolve_tags(tag_for(t) for t in techs)
+
+
+def _fetch_sample(
+    tag: str, fromdate: int, todate: int
+) -> Tuple[Optional[int], List[dict]]:
+    """Window total (if the filter reports it) and up to SAMPLE_Q newest
+    questions.  The first page tells how many pages exist; the rest (only
+    when SAMPLE_Q > 100, a page holds at most 100) are fetched concurrently,
+    never more than the keys' remaining quota."""
+    pagesize = min(100, SAMPLE_Q)
+    first = _fetch_page(tag, 1, fromdate, todate, pagesize)
+    items = list(first.get("items", []))
+    total = first.get("total")
+    if not first.get("has_more"):
+        return total, items
+
+    wanted = SAMPLE_Q if total is None else min(total, SAMPLE_Q)
+    pages = list(range(2, math.ceil(wanted / pagesize) + 1))
+    if APP_KEYS:
+        pages = pages[:max(0, _POOL.headroom())]
+    if pages:
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS,
+                                                len(pages))) as ex:
+            for js in ex.map(
+                lambda n: _fetch_page(tag, n, fromdate, todate, pagesize),
+                pages,
+            ):
+                items.extend(js.get("items", []))
+    return total, items[:SAMPLE_Q]
+
+
+def _fetch_active_since(
+    tag: str, fromdate: int, todate: int, since: int
+) -> List[dict]:
+    """Questions created in the window whose last activity (new question,
+    answer, edit, accept) is at or after *since*, newest activity first."""
+    pagesize = min(100, SAMPLE_Q)
+    items: List[dict] = []
+    for page in range(1, math.ceil(SAMPLE_Q / pagesize) + 1):
+        js = _fetch_page(tag, page, fromdate, todate, pagesize,
+                         sort="activity", min_value=since)
+        items.extend(js.get("items", []))
+        if not js.get("has_more"):
+            break
+    return items
+
+
+def _sync_questions(
+    tag: str, fromdate: int, todate: int
+) -> Tuple[Optional[int], List[dict]]:
+    """The SAMPLE_Q newest questions of the window, via the per-tag store.
+
+    A warm store only asks for questions active since its high-water mark
+    (usually a single page) and updates them in place; questions created
+    before the window are evicted.  A missing or stale store is rebuilt
+    from a fresh sample.  Also returns the window total when the sample
+    call reported it.
+    """
+    store = DiskCache(f"so_questions/{tag}")
+    state = store.get("state") or {"hwm": 0, "questions": {}}
+    total: Optional[int] = None
+    if state["hwm"] < fromdate:  # cold start, or too old to catch up
+        questions: Dict[str, dict] = {}
+        total, items = _fetch_sample(tag, fromdate, todate)
+    else:
+        questions = state["questions"]
+        items = _fetch_active_since(tag, fromdate, todate, state["hwm"])
+    for q in items:
+        questions[str(q["question_id"])] = q
+
+    keep = sorted(
+        (q for q in questions.values() if q["creation_date"] >= fromdate),
+        key=lambda q: q["creation_date"],
+        reverse=True,
+    )[:SAMPLE_Q]
+    store.set("state", {
+        "hwm": todate,
+        "questions": {str(q["question_id"]): q for q in keep},
+    })
+    return total, keep
+
+
+def _tag_info(tag: str) -> Optional[Dict[str, Any]]:
+    info = _TAG_CACHE.get(tag, ttl=TAG_TTL_DAYS * 86_400)
+    if info is None:
+        try:
+            _resolve_tags([tag])
+        except APIBanError:
+            raise
+        except Exception as exc:
+            logger.debug("SO tag lookup failed for %s: %s", tag, exc)
+            return None
+        info = _TAG_CACHE.get(tag)
+    return info
+
+
+def _analyze_question_trends(weekly: List[int]) -> Dict[str, Any]:
+    if not weekly or not any(weekly):
         return {
             "trend_direction": "insufficient_data",
             "growth_rate": 0,
             "period_counts": [],
-            "period_response_times": [],
+            "weekly_counts": weekly,
         }
-
-    seg = span / TREND_PERIODS
-    segments = [
-        [
-            q
-            for q in questions
-            if oldest + i * seg <= q["creation_date"] < oldest + (i + 1) * seg
-        ]
-        for i in range(TREND_PERIODS)
-    ]
-    counts = [len(s) for s in segments]
-
-    resp_times = []
-    for seg in segments:
-        rs = []
-        for q in seg:
-            if q.get("is_answered") and q.get("answers"):
-                first = q["answers"][0]["creation_date"]
-                rs.append((first - q["creation_date"]) / 3600)
-        resp_times.append(sum(rs) / len(rs) if rs else 0)
-
-    if counts[0] < counts[-1]:
-        direction = "increasing"
-    elif counts[0] > counts[-1]:
-        direction = "decreasing"
-    else:
-        direction = "stable"
-
-    growth = (counts[-1] / counts[0] - 1) if counts[0] else 0
+    tr = series_trend(weekly, periods=TREND_PERIODS, rule="endpoints")
     return {
-        "trend_direction": direction,
-        "growth_rate": growth,
-        "period_counts": counts,
-        "period_response_times": resp_times,
+        "trend_direction": tr["direction"],
+        "growth_rate": tr["growth"],
+        "trend_slope": tr["slope"],  # questions/week, per week
+        "period_counts": tr["counts"],
+        "weekly_counts": weekly,
     }
 
 
@@ -202,18 +472,21 @@ def _score(d: Dict[str, Any]) -> float:
     if total_q <= 5:
         return 8.5 - ((total_q - 1) / 4) * 1.5
 
+    # Answer/view stats come from a sample of the questions
+    n = d.get("sample_size") or total_q
+
     s = 0.0
     volume_bonus = VOLUME_BONUS * min(1, total_q / HIGH_VOLUME_THRESHOLD)
     view_bonus = VIEW_COUNT_BONUS * min(1, d["views_avg"] /
                                         VIEW_COUNT_THRESHOLD)
 
-    ans_r = d["answered"] / total_q
+    ans_r = d["answered"] / n
     s += ANSWERED_RATIO_WEIGHT * (1 - ans_r)
 
-    acc_r = d["accepted"] / total_q if total_q else 0
+    acc_r = d["accepted"] / n
     s += ACCEPTED_RATIO_WEIGHT * (1 - acc_r)
 
-    zero_r = d["no_answers"] / total_q
+    zero_r = d["no_answers"] / n
     s += ZERO_ANSWERS_WEIGHT * zero_r
 
     if d["median_response_hr"] is not None:
@@ -261,22 +534,21 @@ def _score(d: Dict[str, Any]) -> float:
 
 def collect_so_signals(tag: str) -> Tuple[Dict[str, Any], float]:
     logger.debug("Collecting StackOverflow signals for %s", tag)
+    info = _tag_info(tag)
+    if info is not None:
+        tag = info["name"] or tag
     now = int(time.time())
     from_ts = now - SINCE_DAYS * 86400
-    all_q: List[dict] = []
-    page = 1
-    while True:
-        js = _fetch_page(tag, page, from_ts, now)
-        all_q.extend(js.get("items", []))
-        if not js.get("has_more") or len(all_q) >= MAX_Q:
-            break
-        page += 1
-        time.sleep(0.2)
-
-    total = len(all_q)
+    # Unknown or unused tags skip every per-tech call
+    empty = info is not None and not info["count"]
+    total, all_q = (0, []) if empty else _sync_questions(tag, from_ts, now)
+    if total is None:  # incremental sync, or fallback filter w/o .total
+        total = _count(tag, from_ts, now)
     if total == 0:
         return {
+            "tag": tag,
             "total_questions": 0,
+            "sample_size": 0,
             "answered": 0,
             "accepted": 0,
             "no_answers": 0,
@@ -290,7 +562,7 @@ def collect_so_signals(tag: str) -> Tuple[Dict[str, Any], float]:
                 "trend_direction": "insufficient_data",
                 "growth_rate": 0,
                 "period_counts": [],
-                "period_response_times": [],
+                "weekly_counts": [],
             },
             "deaditude_score": 10.0,
             "raw": {"questions": []},
@@ -310,7 +582,7 @@ def collect_so_signals(tag: str) -> Tuple[Dict[str, Any], float]:
         if q.get("closed_reason") == "duplicate":
             dup += 1
         if q.get("answers"):
-            fa_ts = q["answers"][0]["creation_date"]
+            fa_ts = min(a["creation_date"] for a in q["answers"])
             first_ans_delta.append(fa_ts - q.get("creation_date", 0))
         views.append(q.get("view_count", 0))
         last_activity = max(last_activity, q.get("last_activity_date", 0))
@@ -322,13 +594,15 @@ def collect_so_signals(tag: str) -> Tuple[Dict[str, Any], float]:
         else None
     )
     views_total = sum(views)
-    views_avg = round(views_total / total, 1)
+    views_avg = round(views_total / len(all_q), 1) if all_q else 0
     views_high = sum(v > 1000 for v in views)
 
-    trend_metrics = _analyze_question_trends(all_q)
+    trend_metrics = _analyze_question_trends(_weekly_counts(tag, now))
 
     metrics = {
+        "tag": tag,
         "total_questions": total,
+        "sample_size": len(all_q),
         "answered": ans,
         "accepted": acc,
         "no_answers": zero,
@@ -7,17 +7,32 @@ YouTube adoption collector (v2.0).
 * CLI: `python youtube_collector.py <tech> [-v]`
 """
 
+import hashlib
 import logging
 import math
 import os
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
 
 import isodate
 from dotenv import load_dotenv
 
+from engine.analytics.trends import iso_to_epoch, period_trend
+from packages.auth.credentials import CredentialPool, env_credentials
+from packages.cache.store import DiskCache
+
 load_dotenv()
-YOUTUBE_API_KEY: str | None = os.getenv("YOUTUBE_API_KEY")
+# YOUTUBE_API_KEYS (comma-separated) and/or the legacy YOUTUBE_API_KEY
+YOUTUBE_API_KEYS: list[str] = env_credentials("YOUTUBE_API_KEYS",
+                                              "YOUTUBE_API_KEY")
+DAILY_UNITS = int(os.getenv("YT_DAILY_UNITS", "10000"))  # per key
+SEARCH_COST = 100  # quota units per search.list call
+VIDEOS_LIST_COST = 1  # quota units per videos.list call
+
+# Units the planner keeps back from search for the videos.list calls
+UNIT_RESERVE = int(os.getenv("YT_UNIT_RESERVE", "200"))
 
 WINDOW_DAYS = int(os.getenv("YT_WINDOW_DAYS", "60"))
 MAX_PAGES = int(os.getenv("YT_MAX_PAGES", "1"))
@@ -62,19 +77,148 @@ QUALITY_MEDIUM_VIEWS = 1_000
 MIN_VIDEO_DURATION = 240
 MIN_VIDEOS_FOR_TRENDS = 3
 
+# Snippet and duration of a video never change, so they are cached (with
+# the duration and publish time already parsed) and known videos only get
+# their view count re-read, at most every STATS_TTL_HOURS.
+STATS_TTL_HOURS = float(os.getenv("YT_STATS_TTL_HOURS", "12"))
+DETAIL_PARTS = "snippet,statistics,contentDetails"
+DETAIL_FIELDS = (
+    "items(id,snippet(publishedAt,categoryId),statistics(viewCount),"
+    "contentDetails(duration))"
+)
+STATS_FIELDS = "items(id,statistics(viewCount))"
+_VIDEO_CACHE = DiskCache("youtube_videos")
 
-# ─── YouTube API client (lazy) ─────────────────────────────────
-def _build_youtube_api():
-    if not YOUTUBE_API_KEY:
-        logger.warning("YouTube collector disabled – missing API key")
-        return None
+
+# ─── YouTube API clients (one per key, lazy) ───────────────────
+# YouTube does not report the remaining quota, so the pool is charged with the
+# documented unit cost of every call and a key that hits "quotaExceeded" is
+# parked until the Pacific-time midnight reset.
+_POOL = CredentialPool("youtube", YOUTUBE_API_KEYS, limit=DAILY_UNITS)
+_CLIENTS: dict[str, Any] = {}
+
+if not _POOL:
+    logger.warning("YouTube collector disabled – missing API key")
+
+
+def _next_pacific_midnight() -> float:
+    now = datetime.now(ZoneInfo("America/Los_Angeles"))
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0,
+                                                 microsecond=0)
+    return midnight.timestamp()
+
+
+# ─── Quota ledger ──────────────────────────────────────────────
+# Units charged to each key are persisted per Pacific day, so a later run
+# on the same day starts from what is really left instead of a full pool.
+# Keys are stored by hash only.
+_LEDGER = DiskCache("youtube_quota")
+_PLAN: Dict[str, int] = {}
+
+# Two-phase batch: ``prepare_batch`` runs every due tech's searches first,
+# then fetches the details of all distinct ids in full 50-id videos.list
+# calls; ``collect_youtube_signals`` only picks its share from here.
+_SEARCH_IDS: Dict[str, List[str]] = {}
+_DETAILS: Dict[str, dict] = {}
+
+
+def _pacific_day() -> str:
+    return datetime.now(ZoneInfo("America/Los_Angeles")).date().isoformat()
+
+
+def _key_id(key: str) -> str:
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+
+
+def _used_today(key: str) -> int:
+    entry = _LEDGER.get(_key_id(key)) or {}
+    return entry.get("used", 0) if entry.get("day") == _pacific_day() else 0
+
+
+def _record(key: str, used: int) -> None:
+    _LEDGER.set(_key_id(key), {"day": _pacific_day(), "used": used})
+
+
+def _load_ledger() -> None:
+    reset_at = _next_pacific_midnight()
+    for key in YOUTUBE_API_KEYS:
+        _POOL.update(key, max(0, DAILY_UNITS - _used_today(key)),
+                     reset_at=reset_at)
+
+
+def _charge(key: str, units: int) -> None:
+    _POOL.spend(key, units)
+    _record(key, _used_today(key) + units)
+
+
+def _exhaust(key: str) -> None:
+    _POOL.exhaust(key, _next_pacific_midnight())
+    _record(key, DAILY_UNITS)
+
+
+_load_ledger()
+
+
+class BudgetDeferred(RuntimeError):
+    """The units left today cannot cover this tech; it should be retried on
+    a later run instead of being saved without YouTube data."""
+
+
+def plan_batch(techs: List[Dict[str, Any]]) -> Dict[str, int]:
+    """search.list calls allowed per tech so that the whole batch fits in
+    the units left today; earlier (staler) techs get any remainder."""
+    per_tech_max = len(QUERIES) * MAX_PAGES
+    calls = max(0, (_POOL.headroom() - UNIT_RESERVE) // SEARCH_COST)
+    if not techs:
+        return {}
+    per = min(per_tech_max, calls // len(techs))
+    extra = calls - per * len(techs) if per < per_tech_max else 0
+    return {
+        t["name"].lower(): per + (1 if i < extra else 0)
+        for i, t in enumerate(techs)
+    }
+
+
+def deferred(techs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Techs of the batch the units left today cannot search for."""
+    if not _POOL:
+        return []
+    plan = plan_batch(techs)
+    return [t for t in techs if plan[t["name"].lower()] <= 0]
+
+
+def prepare_batch(techs: List[Dict[str, Any]]) -> None:
+    _PLAN.update(plan_batch(techs))
+    logger.debug("YouTube search plan: %s", _PLAN)
+    if not _POOL:
+        return
+    after = _published_after()
+    try:
+        for tech in techs:
+            key = tech["name"].lower()
+            if _PLAN.get(key, 0) > 0 and key not in _SEARCH_IDS:
+                _SEARCH_IDS[key] = _search_tech(tech["name"], after)
+    finally:
+        _details_for(
+            sorted({i for ids in _SEARCH_IDS.values() for i in ids})
+        )
+
+
+def _allowance(name: str) -> int:
+    key = name.lower()
+    if key not in _PLAN:
+        _PLAN.update(plan_batch([{"name": name}]))
+    return _PLAN[key]
+
+
+def _build_youtube_api(key: str):
     try:
         from googleapiclient.discovery import build
 
         return build(
             "youtube",
             "v3",
-            developerKey=YOUTUBE_API_KEY,
+            developerKey=key,
             cache_discovery=False,
         )
     except Exception as exc:  # pragma: no cover
@@ -82,16 +226,48 @@ def _build_youtube_api():
         return None
 
 
-yt = _build_youtube_api()
+def _client(key: str):
+    if key not in _CLIENTS:
+        _CLIENTS[key] = _build_youtube_api(key)
+    return _CLIENTS[key]
+
+
+def _execute(make_request: Callable[[Any], Any], cost: int) -> Dict[str, Any]:
+    """Run ``make_request(client).execute()`` on the key with most headroom,
+    rotating to the next key when one runs out of quota."""
+    last_exc: Optional[Exception] = None
+    for _ in range(len(_POOL)):
+        key = _POOL.acquire()
+        client = _client(key) if key else None
+        if client is None:
+            return {}
+        try:
+            res = make_request(client).execute()
+        except Exception as exc:
+            msg = str(exc).lower()
+            if "quota" in msg and "exceed" in msg:
+                _exhaust(key)
+                last_exc = exc
+                continue
+            # Failed calls (5xx, 400, ...) still cost their units.
+            _charge(key, cost)
+            raise
+        _charge(key, cost)
+        return res
+    raise RuntimeError(f"YouTube quota exceeded on all API keys: {last_exc}")
 
 
 # ─── Helpers ───────────────────────────────────────────────────
-def _search(query: str, published_after: str) -> List[str]:
-    if not yt:
-        return []
+def _search(
+    query: str, published_after: str, max_pages: int = MAX_PAGES
+) -> Tuple[List[str], int]:
+    """Video ids for *query* and the number of search calls spent."""
+    if not _POOL:
+        return [], 0
     ids: list[str] = []
     page_token: str | None = None
-    for _ in range(MAX_PAGES):
+    calls = 0
+    for _ in range(max_pages):
         params = {
             "q": query,
             "part": "id",
@@ -102,29 +278,110 @@ def _search(query: str, published_after: str) -> List[str]:
         }
         if page_token:
             params["pageToken"] = page_token
-        res = yt.search().list(**params).execute()
+        res = _execute(lambda c: c.search().list(**params), SEARCH_COST)
+        calls += 1
         ids.extend(item["id"]["videoId"] for item in res.get("items", []))
         page_token = res.get("nextPageToken")
         if not page_token:
             break
-    return ids
+    return ids, calls
 
 
-def _fetch_details(video_ids: List[str]) -> List[dict]:
-    if not yt or not video_ids:
+def _list_videos(video_ids: List[str], part: str, fields: str) -> List[dict]:
+    if not _POOL or not video_ids:
         return []
     out: list[dict] = []
     for i in range(0, len(video_ids), 50):
         chunk = video_ids[i: i + 50]
-        res = (
-            yt.videos()
-            .list(part="snippet,statistics,contentDetails", id=",".join(chunk))
-            .execute()
+        res = _execute(
+            lambda c: c.videos().list(part=part, id=",".join(chunk),
+                                      fields=fields),
+            VIDEOS_LIST_COST,
         )
         out.extend(res.get("items", []))
     return out
 
 
+def _published_after() -> str:
+    return (
+        (datetime.utcnow() - timedelta(days=WINDOW_DAYS))
+        .isoformat("T") + "Z"
+    )
+
+
+def _search_tech(name: str, after: str) -> List[str]:
+    """Distinct video ids from the tech's queries, within its allowance."""
+    allowed = _allowance(name)
+    if allowed <= 0:
+        raise BudgetDeferred("YouTube unit budget for today is used up")
+
+    vid_ids: dict[str, None] = {}  # ordered set
+    for tmpl in QUERIES:
+        ids, used = _search(tmpl.format(tech=name), after,
+                            min(MAX_PAGES, allowed))
+        vid_ids.update(dict.fromkeys(ids))
+        allowed -= used
+        if len(vid_ids) >= 30 or allowed <= 0:
+            break
+    return list(vid_ids)
+
+
+def _video_record(item: dict, published_ts: float) -> dict:
+    return {
+        "id": item["id"],
+        "category": item["snippet"].get("categoryId"),
+        "published": item["snippet"]["publishedAt"],
+        "published_ts": published_ts,
+        "duration_sec": _duration_sec(item["contentDetails"]["duration"]),
+        "views": int(item["statistics"].get("viewCount", 0)),
+    }
+
+
+def _details_for(video_ids: List[str]) -> List[dict]:
+    """Compact records for *video_ids*.  Unknown videos get their full
+    details, cached ones with stale counts only ``part=statistics``."""
+    ttl = STATS_TTL_HOURS * 3600
+    new: List[str] = []
+    stale: Dict[str, dict] = {}
+    for vid in dict.fromkeys(video_ids):
+        if vid in _DETAILS:
+            continue
+        rec = _VIDEO_CACHE.get(vid)
+        if rec is None:
+            new.append(vid)
+        elif _VIDEO_CACHE.age(vid) > ttl:
+            stale[vid] = rec
+        else:
+            _DETAILS[vid] = rec
+
+    updates: Dict[str, dict] = {}
+    for item in _list_videos(list(stale), "statistics", STATS_FIELDS):
+        updates[item["id"]] = {
+            **stale[item["id"]],
+            "views": int(item["statistics"].get("viewCount", 0)),
+        }
+    items = _list_videos(new, DETAIL_PARTS, DETAIL_FIELDS)
+    if items:
+        published = iso_to_epoch(i["snippet"]["publishedAt"] for i in items)
+        for item, ts in zip(items, published):
+            updates[item["id"]] = _video_record(item, float(ts))
+    _VIDEO_CACHE.set_many(updates)
+    _DETAILS.update(updates)
+    return [_DETAILS[i] for i in video_ids if i in _DETAILS]
+
+
+def _prune_video_cache() -> None:
+    """Drop cached videos published before the search window."""
+    cutoff = time.time() - WINDOW_DAYS * 86_400
+    _VIDEO_CACHE.delete_many([
+        vid for vid, rec in _VIDEO_CACHE.items()
+        if rec.get("published_ts", 0) < cutoff
+    ])
+
+
+_prune_video_cache()
+
+
 def _duration_sec(iso_dur: str) -> int:
     try:
         return int(isodate.parse_duration(iso_dur).total_seconds())
@@ -133,75 +390,27 @@ def _duration_sec(iso_dur: str) -> int:
 
 
 def _analyze_video_trends(videos: List[dict]) -> Dict[str, Any]:
-    if len(videos) < MIN_VIDEOS_FOR_TRENDS:
-        return {
-            "trend_direction": "insufficient_data",
-            "growth_rate": 0,
-            "period_counts": [],
-            "period_avg_views": [],
-        }
-
-    for v in videos:
-        v.setdefault(
-            "timestamp",
-            datetime.strptime(
-                v["snippet"]["publishedAt"], "%Y-%m-%dT%H:%M:%SZ"
-            ).timestamp(),
+    tr = None
+    if len(videos) >= MIN_VIDEOS_FOR_TRENDS:
+        tr = period_trend(
+            [v["published_ts"] for v in videos],
+            [v["views"] for v in videos],
+            periods=TREND_PERIODS,
+            rule="shape",
         )
-
-    videos.sort(key=lambda v: v["timestamp"])
-    oldest, newest = videos[0]["timestamp"], videos[-1]["timestamp"]
-    span = newest - oldest
-    if span < 86_400:
+    if tr is None:
         return {
             "trend_direction": "insufficient_data",
             "growth_rate": 0,
             "period_counts": [],
             "period_avg_views": [],
         }
-
-    seg_len = span / TREND_PERIODS
-    segments: list[list[dict]] = [[] for _ in range(TREND_PERIODS)]
-    for v in videos:
-        idx = min(int((v["timestamp"] - oldest) // seg_len), TREND_PERIODS - 1)
-        segments[idx].append(v)
-
-    period_counts = [len(seg) for seg in segments]
-    period_avg_views = [
-        (
-            int(sum(int(v["statistics"].get("viewCount", 0)) for v in seg) /
-                len(seg))
-            if seg
-            else 0
-        )
-        for seg in segments
-    ]
-
-    if len(set(period_counts)) == 1:
-        trend = "stable"
-    elif period_counts[0] < period_counts[-1]:
-        trend = (
-            "increasing" if
-            period_counts == sorted(period_counts) else
-            "growing"
-        )
-    else:
-        trend = (
-            "decreasing"
-            if period_counts == sorted(period_counts, reverse=True)
-            else "declining"
-        )
-
-    growth_rate = (
-        (period_counts[-1] / period_counts[0] - 1)
-        if period_counts[0]
-        else 0
-    )
     return {
-        "trend_direction": trend,
-        "growth_rate": growth_rate,
-        "period_counts": period_counts,
-        "period_avg_views": period_avg_views,
+        "trend_direction": tr["direction"],
+        "growth_rate": tr["growth"],
+        "trend_slope": tr["slope"],
+        "period_counts": tr["counts"],
+        "period_avg_views": [int(v) for v in tr["weight_means"]],
     }
 
 
@@ -209,42 +418,31 @@ def _analyze_video_trends(videos: List[dict]) -> Dict[str, Any]:
 def collect_youtube_signals(tech: Dict[str, str]) -> Tuple[Dict[str, Any],
                                                            float]:
     name = tech["name"]
-    if not yt:
+    if not _POOL:
         return {"video_count": 0, "deaditude_score": 10.0, "raw": {}}, 0.3
 
-    after = (
-        (datetime.utcnow() - timedelta(days=WINDOW_DAYS))
-        .isoformat("T") + "Z"
-    )
-    vid_ids: set[str] = set()
-    for tmpl in QUERIES:
-        vid_ids.update(_search(tmpl.format(tech=name), after))
-        if len(vid_ids) >= 30:
-            break
+    vid_ids = _SEARCH_IDS.get(name.lower())
+    if vid_ids is None:
+        vid_ids = _search_tech(name, _published_after())
 
     if not vid_ids:
         return {"video_count": 0, "deaditude_score": 10.0, "raw": {}}, 0.4
 
-    vids = _fetch_details(list(vid_ids))
+    vids = _details_for(vid_ids)
     filtered = [
         v
         for v in vids
-        if v["snippet"].get("categoryId") in DEV_CATS
-        and _duration_sec(v["contentDetails"]["duration"]) >=
-        MIN_VIDEO_DURATION
+        if v["category"] in DEV_CATS
+        and v["duration_sec"] >= MIN_VIDEO_DURATION
     ]
     if not filtered:
         return {"video_count": 0, "deaditude_score": 10.0, "raw": {}}, 0.4
 
     vc = len(filtered)
-    total_views = (
-        sum(int(v["statistics"].get("viewCount", 0)) for v in filtered)
-    )
+    total_views = sum(v["views"] for v in filtered)
     avg_views = total_views / vc
-    latest = max(v["snippet"]["publishedAt"] for v in filtered)
-    days_since_last = (
-        datetime.utcnow() - datetime.strptime(latest, "%Y-%m-%dT%H:%M:%SZ")
-    ).days
+    latest = max(v["published_ts"] for v in filtered)
+    days_since_last = int((time.time() - latest) // 86_400)
 
     trend = _analyze_video_trends(filtered)
     trend_dir, growth_rate = trend["trend_direction"], trend["growth_rate"]
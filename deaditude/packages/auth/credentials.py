@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+"""credentials.py
+==================
+Round-robin-by-headroom pool of API credentials.
+
+Every collector that authenticates with a token or key can hold several of
+them.  The pool remembers each credential's last reported remaining budget
+and reset time, and ``acquire()`` always hands out the one with the most
+headroom, so throughput grows with the number of credentials provisioned.
+
+* ``env_credentials("DEAD_GITHUB_PATS", "DEAD_GITHUB_PAT") -> [token, ...]``
+* ``CredentialPool(name, tokens, limit).acquire() -> token | None``
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def env_credentials(plural_var: str, single_var: str) -> List[str]:
+    """Comma-separated *plural_var* plus the legacy *single_var*, de-duped."""
+    out: List[str] = []
+    raw = (os.getenv(plural_var) or "").split(",")
+    raw.append(os.getenv(single_var) or "")
+    for tok in raw:
+        tok = tok.strip()
+        if tok and tok not in out:
+            out.append(tok)
+    return out
+
+
+class _Credential:
+    __slots__ = ("token", "limit", "remaining", "reset_at")
+
+    def __init__(self, token: str, limit: int):
+        self.token = token
+        self.limit = limit
+        self.remaining = limit
+        self.reset_at = 0.0
+
+    def headroom(self, now: float) -> int:
+        if self.reset_at and now >= self.reset_at:
+            self.remaining, self.reset_at = self.limit, 0.0
+        return self.remaining
+
+
+class CredentialPool:
+    """Thread-safe set of credentials sharing one kind of rate limit."""
+
+    def __init__(self, name: str, tokens: List[str], limit: int):
+        self.name = name
+        self._creds: Dict[str, _Credential] = {
+            t: _Credential(t, limit) for t in tokens
+        }
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._creds)
+
+    def __bool__(self) -> bool:
+        return bool(self._creds)
+
+    def acquire(self) -> Optional[str]:
+        """Credential with the most remaining budget (``None`` if empty).
+
+        When every credential is exhausted the one that resets first is
+        returned, so callers still get a meaningful rate-limit error.
+        """
+        with self._lock:
+            if not self._creds:
+                return None
+            now = time.time()
+            best = max(
+                self._creds.values(),
+                key=lambda c: (c.headroom(now), -c.reset_at),
+            )
+            if best.remaining <= 0:
+                best = min(self._creds.values(), key=lambda c: c.reset_at)
+                logger.debug("%s pool exhausted until %s", self.name,
+                             best.reset_at)
+            return best.token
+
+    def update(
+        self,
+        token: Optional[str],
+        remaining: Optional[int],
+        reset_at: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> None:
+        """Record the budget reported by the API for *token*."""
+        with self._lock:
+            cred = self._creds.get(token or "")
+            if cred is None:
+                return
+            if limit is not None:
+                cred.limit = limit
+            if remaining is not None:
+                cred.remaining = remaining
+            if reset_at is not None:
+                cred.reset_at = reset_at
+
+    def spend(self, token: Optional[str], cost: int = 1) -> None:
+        """Decrement the local estimate for APIs that do not report it."""
+        with self._lock:
+            cred = self._creds.get(token or "")
+            if cred is not None:
+                cred.headroom(time.time())
+                cred.remaining -= cost
+
+    def exhaust(self, token: Optional[str], until: float) -> None:
+        """Take *token* out of rotation until the epoch *until*."""
+        self.update(token, 0, reset_at=until)
+        logger.debug("%s credential exhausted until %s", self.name, until)
+
+    def headroom(self) -> int:
+        """Total remaining budget across the pool."""
+        with self._lock:
+            now = time.time()
+            return sum(max(0, c.headroom(now)) for c in self._creds.values())
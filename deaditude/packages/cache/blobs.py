@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+"""blobs.py
+============
+Content-addressed, compressed store for raw collector payloads.
+
+Payloads are serialised to canonical JSON, hashed with SHA-256 and written
+once to ``<CACHE_DIR>/blobs/<aa>/<hash>.zst``.  Identical payloads from later
+runs (or other techs) map to the same file, so only the reference
+``"sha256:<hex>"`` needs to live in the snapshot row.
+
+zstandard is used when installed; otherwise blobs fall back to zlib
+(``.zz``).  The hash is taken over the uncompressed JSON, so a reference
+stays valid whichever codec wrote it.
+
+* ``BlobStore().put(payload) -> (ref, created)``
+* ``BlobStore().get(ref) -> payload | None``
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zlib
+from typing import Any, Optional, Tuple
+
+from packages.cache.store import CACHE_DIR
+
+try:  # optional, much better ratio/speed than zlib
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+ZSTD_LEVEL = 10
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_json(payload: Any) -> bytes:
+    return json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), default=str
+    ).encode("utf-8")
+
+
+def _compress(data: bytes) -> Tuple[bytes, str]:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), "zst"
+    return zlib.compress(data, 9), "zz"
+
+
+def _decompress(data: bytes, ext: str) -> bytes:
+    if ext == "zst":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst blobs")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class BlobStore:
+    """Write-once blob directory keyed by the SHA-256 of the payload."""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.path.join(CACHE_DIR, "blobs")
+
+    def _path(self, digest: str, ext: str) -> str:
+        return os.path.join(self.root, digest[:2], f"{digest}.{ext}")
+
+    def _find(self, digest: str) -> Optional[str]:
+        for ext in ("zst", "zz"):
+            path = self._path(digest, ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def put(self, payload: Any) -> Tuple[str, bool]:
+        """Store *payload*; return its reference and whether it was new."""
+        data = canonical_json(payload)
+        digest = hashlib.sha256(data).hexdigest()
+        ref = f"sha256:{digest}"
+        if self._find(digest):
+            return ref, False
+        blob, ext = _compress(data)
+        path = self._path(digest, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(blob)
+        os.replace(tmp, path)
+        return ref, True
+
+    def read_bytes(self, ref: str) -> Optional[Tuple[bytes, str]]:
+        """Compressed bytes and codec extension for *ref*, if stored."""
+        path = self._find(ref.split(":", 1)[-1])
+        if path is None:
+            return None
+        with open(path, "rb") as fh:
+            return fh.read(), path.rsplit(".", 1)[-1]
+
+    def get(self, ref: str) -> Any:
+        found = self.read_bytes(ref)
+        if found is None:
+            return None
+        return json.loads(_decompress(*found))
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+"""store.py
+============
+Tiny JSON-file cache shared by the collectors.
+
+Each *namespace* lives in its own ``<CACHE_DIR>/<namespace>.json`` file and
+maps string keys to ``{"ts": <epoch>, "value": <json>}`` entries.  The TTL is
+chosen by the reader, so one entry can serve callers with different
+freshness requirements.
+
+* ``DiskCache(namespace).get(key, ttl=None) -> value | None``
+* ``DiskCache(namespace).set(key, value)`` / ``set_many({key: value})``
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CACHE_DIR = os.getenv("DEADITUDE_CACHE_DIR", ".cache")
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """Namespaced key/value store persisted as a single JSON document."""
+
+    def __init__(self, namespace: str, root: Optional[str] = None):
+        self.namespace = namespace
+        self.path = os.path.join(root or CACHE_DIR, f"{namespace}.json")
+        self._lock = threading.RLock()
+        self._data: Optional[Dict[str, Dict[str, Any]]] = None
+
+    # ───────────────────────── internals ──────────────────────────
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._data is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as fh:
+                    self._data = json.load(fh)
+            except FileNotFoundError:
+                self._data = {}
+            except Exception as exc:
+                logger.warning("Discarding unreadable cache %s: %s",
+                               self.path, exc)
+                self._data = {}
+        return self._data
+
+    def _flush(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".",
+                                   prefix=f".{os.path.basename(self.path)}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(self._data, fh, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except Exception as exc:
+            logger.warning("Cannot write cache %s: %s", self.path, exc)
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    # ───────────────────────── public API ─────────────────────────
+    def get(self, key: str, ttl: Optional[float] = None) -> Any:
+        """Return the cached value, or ``None`` if missing / older than *ttl*
+        seconds."""
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is None:
+            return None
+        if ttl is not None and time.time() - entry.get("ts", 0) > ttl:
+            return None
+        return entry.get("value")
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._load()[key] = {"ts": time.time(), "value": value}
+            self._flush()
+
+    def set_many(self, values: Mapping[str, Any],
+                 drop: Iterable[str] = ()) -> None:
+        """``set`` for several keys, and removal of the keys in *drop*, with
+        a single write."""
+        with self._lock:
+            data = self._load()
+            removed = [k for k in drop if data.pop(k, None) is not None]
+            if not values and not removed:
+                return
+            now = time.time()
+            for key, value in values.items():
+                data[key] = {"ts": now, "value": value}
+            self._flush()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._flush()
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            data = self._load()
+            removed = [k for k in keys if data.pop(k, None) is not None]
+            if removed:
+                self._flush()
+
+    def age(self, key: str) -> Optional[float]:
+        """Seconds since *key* was written, or ``None`` if absent."""
+        with self._lock:
+            entry = self._load().get(key)
+        return None if entry is None else time.time() - entry.get("ts", 0)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        with self._lock:
+            snapshot = list(self._load().items())
+        for key, entry in snapshot:
+            yield key, entry.get("value")
@@ -15,6 +15,9 @@ from dotenv import load_dotenv
 from postgrest.exceptions import APIError
 from supabase import Client, create_client
 
+from packages.cache.blobs import BlobStore
+from packages.cache.store import DiskCache
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
@@ -24,6 +27,14 @@ supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 ENABLE_REVALIDATION = os.getenv("ENABLE_REVALIDATION",
                                 "true").lower() == "true"
 DEBUG_LOGGING = os.getenv("DEBUG_LOGGING", "false").lower() == "true"
+# Supabase Storage bucket holding the raw-payload blobs.  Without it (or if
+# an upload fails) raw payloads stay inline in the snapshot row: the local
+# blob directory is only a cache and cannot be the sole copy.
+RAW_BLOB_BUCKET = os.getenv("RAW_BLOB_BUCKET", "")
+
+_blobs = BlobStore()
+# refs confirmed present in RAW_BLOB_BUCKET
+_UPLOADED = DiskCache("raw_blob_uploads")
 
 logger = logging.getLogger(__name__)
 if DEBUG_LOGGING and not logger.handlers:
@@ -43,6 +54,47 @@ def _today_iso() -> str:
     return datetime.utcnow().date().isoformat()
 
 
+def _upload_blob(ref: str) -> bool:
+    """Make sure *ref* is in RAW_BLOB_BUCKET; ``True`` once it is."""
+    if _UPLOADED.get(ref) is not None:
+        return True
+    found = _blobs.read_bytes(ref)
+    if found is None:
+        return False
+    blob, ext = found
+    digest = ref.split(":", 1)[1]
+    try:
+        supabase.storage.from_(RAW_BLOB_BUCKET).upload(
+            f"{digest[:2]}/{digest}.{ext}",
+            blob,
+            {"content-type": "application/octet-stream"},
+        )
+    except Exception as exc:
+        # Content-addressed, so an existing object is the same payload
+        if "duplicate" not in str(exc).lower() and "409" not in str(exc):
+            logger.warning("Blob upload failed for %s: %s", ref, exc)
+            return False
+    _UPLOADED.set(ref, True)
+    return True
+
+
+def _offload_raw(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Swap the bulky ``raw`` payload for a content-addressed reference once
+    it is stored in RAW_BLOB_BUCKET; otherwise keep it inline."""
+    if not RAW_BLOB_BUCKET or not isinstance(data, dict) or "raw" not in data:
+        return data
+    try:
+        ref, _ = _blobs.put(data["raw"])
+    except Exception as exc:
+        logger.warning("Cannot store raw payload, keeping it inline: %s", exc)
+        return data
+    if not _upload_blob(ref):
+        return data
+    out = data.copy()
+    out["raw"] = {"blob": ref}
+    return out
+
+
 def _sanitize_github(raw: Dict[str, Any]) -> Dict[str, Any]:
     data = raw.copy()
     if "raw" in data:
@@ -152,17 +204,19 @@ def insert_snapshot(
         }
     )
 
-    # --- Simple passthrough JSONB columns ----------------------------------
+    # --- Passthrough JSONB columns (raw payloads stored as blob refs) -------
     snapshot.update(
         {
-            "reddit_metrics": metrics.get("reddit", {}),
-            "hn_metrics": metrics.get("hn", {}),
-            "so_metrics": metrics.get("stackoverflow", {}),
-            "youtube_metrics": metrics.get("youtube", {}),
-            "stackshare_metrics": metrics.get("companies")
-            or metrics.get("stackshare", {}),
-            "google_jobs": metrics.get("jobs") or
-            metrics.get("google_jobs", {}),
+            "reddit_metrics": _offload_raw(metrics.get("reddit", {})),
+            "hn_metrics": _offload_raw(metrics.get("hn", {})),
+            "so_metrics": _offload_raw(metrics.get("stackoverflow", {})),
+            "youtube_metrics": _offload_raw(metrics.get("youtube", {})),
+            "stackshare_metrics": _offload_raw(
+                metrics.get("companies") or metrics.get("stackshare", {})
+            ),
+            "google_jobs": _offload_raw(
+                metrics.get("jobs") or metrics.get("google_jobs", {})
+            ),
         }
     )
 
@@ -202,6 +256,7 @@ def insert_snapshot(
 # ---------------------------------------------------------------------------
 def _augment_so(dest: Dict[str, Any], so: Dict[str, Any]) -> None:
     total = so.get("total_questions", 0)
+    sampled = so.get("sample_size", total)  # answer stats cover a sample
     trend = so.get("trend_metrics", {})
     last_activity_days = 0
     if iso := so.get("last_activity"):
@@ -218,12 +273,12 @@ def _augment_so(dest: Dict[str, Any], so: Dict[str, Any]) -> None:
             "so_trend_growth_rate": trend.get("growth_rate", 0),
             "so_period_counts": trend.get("period_counts", {}),
             "so_total_questions": total,
-            "so_answered_ratio": (so.get("answered", 0) / total)
-            if total else 0,
-            "so_accepted_ratio": (so.get("accepted", 0) / total)
-            if total else 0,
-            "so_zero_answer_ratio": (so.get("no_answers", 0) / total)
-            if total else 0,
+            "so_answered_ratio": (so.get("answered", 0) / sampled)
+            if sampled else 0,
+            "so_accepted_ratio": (so.get("accepted", 0) / sampled)
+            if sampled else 0,
+            "so_zero_answer_ratio": (so.get("no_answers", 0) / sampled)
+            if sampled else 0,
             "so_median_response_hr": so.get("median_response_hr", 0),
             "so_last_activity_days": last_activity_days,
             "so_quality": so.get("quality", 0.5),
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Microbenchmark of the companies collector's HTML extraction on saved pages.
+
+Each page is run through the original full-document ``html.parser`` parse
+and through the current extraction path (regex pre-check, lxml or strained
+BeautifulSoup), and the best-of-N timings and whether both paths produced
+the same result are reported.
+
+Save pages first, e.g.:
+    curl -sL https://stackshare.io/flutter -o /tmp/ss-flutter.html
+    curl -sL https://flutter.dev/showcase -o /tmp/sc-flutter.html
+
+Usage:
+    python -m scripts.bench_html_extract stackshare /tmp/ss-*.html [-n 20]
+    python -m scripts.bench_html_extract showcase /tmp/sc-*.html
+"""
+
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+from typing import Any, Callable, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bs4  # noqa: E402
+
+from engine.collectors import companies  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("bench-html-extract")
+
+
+def _legacy_stackshare(text: str) -> Tuple[int, List[str]]:
+    count, found = companies._ss_bs4(text)
+    return count, found[:40]
+
+
+def _legacy_showcase(text: str) -> List[str]:
+    soup = bs4.BeautifulSoup(text, "html.parser")
+    names = set()
+    for img in soup.find_all("img", alt=True):
+        alt = img["alt"].strip()
+        if 2 <= len(alt) <= 40:
+            names.add(alt)
+    for h in soup.find_all(["h2", "h3", "h4"]):
+        txt = h.get_text(" ", strip=True)
+        if 2 <= len(txt) <= 40 and re.match(r"[A-Z].*", txt):
+            names.add(txt)
+    return sorted(names)
+
+
+KINDS = {
+    "stackshare": (_legacy_stackshare, companies.parse_stackshare),
+    "showcase": (_legacy_showcase, companies.parse_showcase),
+}
+
+
+def _best_of(fn: Callable[[str], Any], text: str, n: int) -> float:
+    best = float("inf")
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(
+        description="Compare legacy and fast HTML extraction on saved pages"
+    )
+    p.add_argument("kind", choices=sorted(KINDS))
+    p.add_argument("pages", nargs="+", help="saved HTML files")
+    p.add_argument("-n", "--repeat", type=int, default=10,
+                   help="runs per page and path, best one is kept")
+    args = p.parse_args()
+
+    legacy, fast = KINDS[args.kind]
+    engine = "lxml" if companies.lxml_html is not None else "bs4-strained"
+    logger.info("fast path engine: %s", engine)
+    total_legacy = total_fast = 0.0
+    for path in args.pages:
+        with open(path, "r", encoding="utf-8", errors="replace") as fh:
+            text = fh.read()
+        t_legacy = _best_of(legacy, text, args.repeat)
+        t_fast = _best_of(fast, text, args.repeat)
+        total_legacy += t_legacy
+        total_fast += t_fast
+        logger.info(
+            "%s: %d KB  legacy %.1f ms  fast %.1f ms  x%.1f  %s",
+            os.path.basename(path),
+            len(text) // 1024,
+            t_legacy * 1000,
+            t_fast * 1000,
+            t_legacy / t_fast if t_fast else float("inf"),
+            "same" if legacy(text) == fast(text) else "DIFFERENT",
+        )
+    logger.info("total: legacy %.1f ms  fast %.1f ms  x%.1f",
+                total_legacy * 1000, total_fast * 1000,
+                total_legacy / total_fast if total_fast else float("inf"))
+
+
+if __name__ == "__main__":
+    main()
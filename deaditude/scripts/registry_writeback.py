@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+"""
+Write values discovered by the collectors back into the tech-registry YAML
+files, so that later runs read them from the registry instead of repeating
+discovery calls.
+
+Usage:
+    python -m scripts.registry_writeback {showcase_url,subreddit}
+        [--dry-run] [--overwrite]
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from packages.cache.store import DiskCache  # noqa: E402
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("registry-writeback")
+
+TECHNOLOGIES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
+        __file__)))),
+    "tech-registry",
+    "technologies",
+)
+
+# Key order used by tech-registry/scripts/export.js
+FIELD_ORDER = [
+    "id",
+    "name",
+    "owner",
+    "repo",
+    "subreddit",
+    "stackshare_slug",
+    "description",
+    "creation_year",
+    "showcase_url",
+    "their_stack_slug",
+    "category",
+]
+
+# registry field -> (cache namespace, cached value -> registry value)
+SOURCES: Dict[str, Tuple[str, Callable[[Any], Optional[str]]]] = {
+    "subreddit": ("reddit_subreddits", lambda v: (v or {}).get("name")),
+    "showcase_url": ("showcase_pages", lambda v: (v or {}).get("url")),
+}
+
+_KEY_RE = re.compile(r"^([A-Za-z_]+):\s*(.*)$")
+
+
+def _scalar(value: str) -> str:
+    if re.fullmatch(r"[\w./:-]+", value):
+        return value
+    return json.dumps(value)  # a JSON string is a valid YAML scalar
+
+
+def _registry_files() -> List[str]:
+    out = []
+    for root, _, files in os.walk(TECHNOLOGIES_DIR):
+        out.extend(os.path.join(root, f) for f in files if f.endswith(".yaml"))
+    return sorted(out)
+
+
+def _set_field(lines: List[str], field: str, value: str,
+               overwrite: bool) -> Optional[List[str]]:
+    """Return updated *lines*, or ``None`` if nothing had to change."""
+    keys = {}
+    for i, line in enumerate(lines):
+        m = _KEY_RE.match(line)
+        if m:
+            keys[m.group(1)] = i
+    new_line = f"{field}: {_scalar(value)}\n"
+    if field in keys:
+        if not overwrite or lines[keys[field]] == new_line:
+            return None
+        lines[keys[field]] = new_line
+        return lines
+    rank = FIELD_ORDER.index(field) if field in FIELD_ORDER else len(
+        FIELD_ORDER)
+    before = [
+        i for k, i in keys.items()
+        if k in FIELD_ORDER and FIELD_ORDER.index(k) < rank
+    ]
+    at = max(before) + 1 if before else len(lines)
+    if lines and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+    lines.insert(at, new_line)
+    return lines
+
+
+def write_back(field: str, dry_run: bool = False,
+               overwrite: bool = False) -> int:
+    """Copy cached *field* values into matching registry files."""
+    namespace, extract = SOURCES[field]
+    values = {
+        key: extract(v) for key, v in DiskCache(namespace).items()
+    }
+    changed = 0
+    for path in _registry_files():
+        with open(path, "r", encoding="utf-8") as fh:
+            lines = fh.readlines()
+        name = next(
+            (m.group(2).strip().strip("'\"") for m in map(_KEY_RE.match, lines)
+             if m and m.group(1) == "name"),
+            None,
+        )
+        value = values.get((name or "").lower())
+        if not value:
+            continue
+        updated = _set_field(lines, field, value, overwrite)
+        if updated is None:
+            continue
+        changed += 1
+        logger.info("%s: %s → %s", os.path.relpath(path, TECHNOLOGIES_DIR),
+                    field, value)
+        if not dry_run:
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.writelines(updated)
+    return changed
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(
+        description="Write cached discoveries back into tech-registry YAML"
+    )
+    p.add_argument("field", choices=sorted(SOURCES))
+    p.add_argument("--dry-run", action="store_true",
+                   help="show what would change without writing files")
+    p.add_argument("--overwrite", action="store_true",
+                   help="replace values already present in the registry")
+    args = p.parse_args()
+    n = write_back(args.field, dry_run=args.dry_run, overwrite=args.overwrite)
+    logger.info("%d registry file(s) %s", n,
+                "would change" if args.dry_run else "updated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+-- Migration to add curated aliases to tech_registry for title matching (HN, Reddit fallback)
+ALTER TABLE tech_registry
+  -- Add aliases field (other names the technology goes by in post titles)
+  ADD COLUMN IF NOT EXISTS aliases TEXT[];
+
+-- Add migration info to log
+INSERT INTO public.schema_migrations (version, inserted_at)
+VALUES ('009_tech_aliases', NOW())
+ON CONFLICT DO NOTHING;
+
+COMMENT ON COLUMN tech_registry.aliases IS 'Other names of the technology matched as whole words in post titles, besides its name (e.g. AWS, k8s)';
@@ -0,0 +1,72 @@
+import pytest
+
+from engine.analytics.matcher import TermMatcher, tech_aliases
+
+# Registry rows as they come from tech_registry (see tech-registry/).
+REGISTRY = [
+    {"id": "october", "name": "October CMS"},
+    {"id": "spring", "name": "Spring boot",
+     "aliases": ["Spring Framework"]},
+    {"id": "phoenix", "name": "Phoenix Framework",
+     "aliases": ["Phoenix LiveView"]},
+    {"id": "maui", "name": ".NET MAUI"},
+    {"id": "nest", "name": "NestJS"},
+    {"id": "expressjs", "name": "Express js"},
+    {"id": "nextjs", "name": "Next.js"},
+    {"id": "aws", "name": "Amazon Web Services", "aliases": ["AWS"]},
+    {"id": "csharp", "name": "C#"},
+    {"id": "go", "name": "Go"},
+]
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return TermMatcher({t["id"]: tech_aliases(t) for t in REGISTRY})
+
+
+@pytest.mark.parametrize("title", [
+    "Apple event in October",
+    "Spring cleaning your dotfiles",
+    "Moving from Phoenix, Arizona to Berlin",
+    "Maui wildfire recovery efforts",
+    "I replaced my Nest thermostat with a Raspberry Pi",
+    "What to learn next: JS or TS?",
+    "Ask HN: how do you express intent in code reviews?",
+])
+def test_everyday_words_do_not_match(matcher, title):
+    assert matcher.find(title) == set()
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("Express.js 5.0 released", {"expressjs"}),
+    ("ExpressJS vs Fastify", {"expressjs"}),
+    ("NestJS 10 is out", {"nest"}),
+    ("Building APIs with Nest.js", {"nest"}),
+    ("October CMS 3.0", {"october"}),
+    ("Spring Boot 3.2 and virtual threads", {"spring"}),
+    ("What's new in the Spring Framework", {"spring"}),
+    ("Phoenix LiveView 1.0", {"phoenix"}),
+    (".NET MAUI in production", {"maui"}),
+    ("Next.js app router, one year later", {"nextjs"}),
+    ("AWS outage in us-east-1", {"aws"}),
+    ("C# 12 primary constructors", {"csharp"}),
+    ("Go 1.22 release notes", {"go"}),
+])
+def test_names_and_curated_aliases_match(matcher, title, expected):
+    assert matcher.find(title) == expected
+
+
+def test_ids_are_not_aliases():
+    assert "october" not in tech_aliases({"id": "october",
+                                          "name": "October CMS"})
+    assert "nest" not in tech_aliases({"id": "nest", "name": "NestJS"})
+
+
+def test_name_variants():
+    assert tech_aliases("Express js") == {
+        "express js", "express.js", "expressjs"}
+    assert tech_aliases({"name": "Joomla! CMS"}) == {
+        "joomla! cms", "joomla cms"}
+    # No single-letter or bare-stem variants
+    assert tech_aliases("C#") == {"c#"}
+    assert "next" not in tech_aliases("Next.js")
@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+import pytest
+
+from engine.collectors import reddit
+
+TECHS = [
+    {"id": "october", "name": "October CMS"},
+    {"id": "spring", "name": "Spring boot"},
+    {"id": "phoenix", "name": "Phoenix Framework"},
+    {"id": "nest", "name": "NestJS"},
+    {"id": "expressjs", "name": "Express js"},
+]
+
+
+def _post(i, title):
+    return reddit._Post(f"t3_{i}", title, 10, time.time() - 3600,
+                        "https://example.com", "programming", 2)
+
+
+@pytest.fixture
+def fallback(monkeypatch):
+    """Runs the fallback-sub matching over *titles* and returns the
+    matched titles per tech name."""
+    def run(titles):
+        monkeypatch.setattr(reddit, "reddit", object())
+        monkeypatch.setattr(reddit, "_FALLBACK_POOL",
+                            [_post(i, t) for i, t in enumerate(titles)])
+        monkeypatch.setattr(reddit, "_FALLBACK_MATCHES", {})
+        asyncio.run(reddit._prepare_batch(TECHS))
+        return {
+            key: [p.title for p in posts]
+            for key, posts in reddit._FALLBACK_MATCHES.items()
+        }
+    return run
+
+
+def test_everyday_titles_are_not_assigned(fallback):
+    matches = fallback([
+        "Is it worth learning to code in October?",
+        "Spring break side project: a tiny Lisp",
+        "Rising from the ashes like a phoenix: my career change",
+        "Empty nest, new hobby: writing a compiler",
+        "How do you express ownership in Rust?",
+    ])
+    assert all(titles == [] for titles in matches.values())
+
+
+def test_tech_titles_are_assigned(fallback):
+    matches = fallback([
+        "Migrating a blog from October CMS to Astro",
+        "Spring Boot or Quarkus for a new service?",
+        "Phoenix Framework LiveView in production",
+        "Nest.js module structure for large apps",
+        "Express.js 5.0 released",
+    ])
+    assert matches == {
+        "october cms": ["Migrating a blog from October CMS to Astro"],
+        "spring boot": ["Spring Boot or Quarkus for a new service?"],
+        "phoenix framework": ["Phoenix Framework LiveView in production"],
+        "nestjs": ["Nest.js module structure for large apps"],
+        "express js": ["Express.js 5.0 released"],
+    }